@@ -32,6 +32,16 @@ class UserAdmin(BaseUserAdmin):
         if not obj:
             return list()
         return super().get_inline_instances(request, obj)
+    
+    def save_related(self, request, form, formsets, change):
+        """Keep the profile's user type in sync with the saved user."""
+        super().save_related(request, form, formsets, change)
+        try:
+            profile = form.instance.profile
+        except UserProfile.DoesNotExist:
+            return
+        profile.sync_user_type(form.instance)
+        profile.save()
 
 
 # Re-register UserAdmin
@@ -47,7 +57,8 @@ class UserProfileAdmin(admin.ModelAdmin):
     Provides detailed admin interface for managing user profiles.
     """
     list_display = ('user', 'user_type', 'dir_name', 'is_manager', 'is_normal_user', 'created_at')
-    list_filter = ('user_type', 'is_manager', 'is_normal_user', 'created_at')
+    list_filter = ('user_type', 'created_at')
+    list_select_related = ('user',)
     search_fields = ('user__username', 'user__email', 'user__first_name', 'user__last_name', 'dir_name')
     readonly_fields = ('created_at', 'updated_at')
     
@@ -64,6 +75,7 @@ class UserProfileAdmin(admin.ModelAdmin):
         }),
     )
     
-    def get_queryset(self, request):
-        """Optimize queryset with user information."""
-        return super().get_queryset(request).select_related('user')
+    def save_model(self, request, obj, form, change):
+        """Reconcile the user type before saving the profile."""
+        obj.sync_user_type()
+        super().save_model(request, obj, form, change)
\ No newline at end of file
@@ -0,0 +1,35 @@
+"""
+Authentication backends for auth app.
+"""
+from django.contrib.auth import get_user_model
+from django.contrib.auth.backends import ModelBackend
+
+UserModel = get_user_model()
+
+
+class ProfileModelBackend(ModelBackend):
+    """
+    Model backend that loads the user's profile along with the user.
+
+    The login serializer reads ``user.profile`` right after authenticating;
+    joining it here saves a separate profile query per login.
+    """
+
+    def authenticate(self, request, username=None, password=None, **kwargs):
+        """Authenticate by username and password, preloading ``profile``."""
+        if username is None:
+            username = kwargs.get(UserModel.USERNAME_FIELD)
+        if username is None or password is None:
+            return None
+        try:
+            user = UserModel._default_manager.select_related('profile').get(
+                **{UserModel.USERNAME_FIELD: username}
+            )
+        except UserModel.DoesNotExist:
+            # Run the default password hasher once to reduce the timing
+            # difference between an existing and a nonexistent user.
+            UserModel().set_password(password)
+        else:
+            if user.check_password(password) and self.user_can_authenticate(user):
+                return user
+        return None
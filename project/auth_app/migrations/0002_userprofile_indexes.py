@@ -0,0 +1,28 @@
+# Generated by Django 5.2.18 on 2026-10-14 18:56
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("auth_app", "0001_initial"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="userprofile",
+            index=models.Index(
+                fields=["user_type"], name="auth_user_p_user_ty_a41604_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="userprofile",
+            index=models.Index(
+                fields=["is_manager", "is_normal_user"],
+                name="auth_user_p_is_mana_6c1d76_idx",
+            ),
+        ),
+    ]
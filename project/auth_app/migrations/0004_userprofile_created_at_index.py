@@ -0,0 +1,21 @@
+# Generated by Django 5.2.18 on 2026-10-14 19:04
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("auth_app", "0002_userprofile_indexes"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="userprofile",
+            index=models.Index(
+                fields=["-created_at"], name="auth_user_p_created_2114cf_idx"
+            ),
+        ),
+    ]
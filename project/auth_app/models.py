@@ -1,14 +1,49 @@
 """
 Auth app models for user management and authentication.
 """
-from django.db import models
+from django.conf import settings
+from django.core.cache import cache
+from django.db import models, transaction
 from django.contrib.auth.models import User
-from django.db.models.signals import post_save
+from django.db.models.signals import post_delete, post_save
 from django.dispatch import receiver
+from functools import cached_property
+from typing import Any, Dict, Iterable, List
 import logging
+import os
 
 logger = logging.getLogger(__name__)
 
+_MASTER_DIR = settings.MASTER_DIR
+
+# Seconds an authenticated user (with profile) stays in the cache
+USER_CACHE_TIMEOUT = 30
+
+# (is_superuser, is_manager) -> (user_type, is_manager, is_normal_user)
+_USER_TYPE_TABLE = {
+    (True, True): ('superuser', False, False),
+    (True, False): ('superuser', False, False),
+    (False, True): ('manager', True, False),
+    (False, False): ('normal', False, True),
+}
+
+
+def build_dir_name(username: str, user_id: int) -> str:
+    """
+    Build the directory name assigned to a new user.
+    
+    The name is stored on the profile when it is created, so it keeps
+    pointing at the same directory if the user is later renamed.
+    
+    Args:
+        username: The user's username
+        user_id: The user's primary key
+        
+    Returns:
+        str: Directory name inside MASTER_DIR
+    """
+    return f"user_{username}_{user_id}"
+
 
 class UserProfile(models.Model):
     """
@@ -49,49 +84,102 @@ class UserProfile(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
+    # Columns compared against their loaded values to build update_fields
+    TRACKED_FIELDS = ('user_id', 'is_manager', 'is_normal_user', 'dir_name', 'user_type')
+    
     class Meta:
         """Meta options for UserProfile model."""
         verbose_name = "User Profile"
         verbose_name_plural = "User Profiles"
         db_table = 'auth_user_profile'
+        indexes = [
+            models.Index(fields=['user_type']),
+            models.Index(fields=['is_manager', 'is_normal_user']),
+            models.Index(fields=['-created_at']),
+        ]
     
     def __str__(self) -> str:
         """String representation of UserProfile."""
         return f"{self.user.username} - {self.user_type}"
     
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        """Remember the loaded column values for change tracking."""
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_values = dict(zip(field_names, values))
+        return instance
+    
+    def _snapshot_tracked_fields(self) -> Dict[str, Any]:
+        """Get the current values of the loaded tracked fields."""
+        return {
+            field: self.__dict__[field]
+            for field in self.TRACKED_FIELDS
+            if field in self.__dict__
+        }
+    
+    def get_changed_fields(self) -> List[str]:
+        """
+        Get the tracked fields that differ from their loaded values.
+        
+        Deferred fields that were never accessed are left out.
+        """
+        loaded_values = getattr(self, '_loaded_values', {})
+        return [
+            field for field, value in self._snapshot_tracked_fields().items()
+            if field not in loaded_values or loaded_values[field] != value
+        ]
+    
     def save(self, *args, **kwargs) -> None:
-        """Override save method to add logging and validation."""
-        if hasattr(self, '_state') and self._state.adding:
-            logger.info(f"Creating new user profile for user: {self.user.username}")
-        else:
-            logger.info(f"Updating user profile for user: {self.user.username}")
+        """
+        Override save method to add logging.
         
-        # Ensure user type consistency
-        if self.user.is_superuser:
-            self.user_type = 'superuser'
-            self.is_manager = False
-            self.is_normal_user = False
-        elif self.is_manager:
-            self.user_type = 'manager'
-            self.is_normal_user = False
+        Updates of a previously loaded or saved profile write only the
+        changed tracked columns plus ``updated_at``, unless the caller passes
+        ``update_fields`` itself.
+        """
+        if hasattr(self, '_state') and self._state.adding:
+            logger.info("Creating new user profile for user id: %s", self.user_id)
         else:
-            self.user_type = 'normal'
-            self.is_normal_user = True
-            self.is_manager = False
+            logger.info("Updating user profile for user id: %s", self.user_id)
+            if (
+                hasattr(self, '_loaded_values')
+                and kwargs.get('update_fields') is None
+                and not kwargs.get('force_insert')
+                and not args
+            ):
+                kwargs['update_fields'] = self.get_changed_fields() + ['updated_at']
         
         super().save(*args, **kwargs)
+        self._loaded_values = self._snapshot_tracked_fields()
+    
+    def sync_user_type(self, user: User | None = None) -> None:
+        """
+        Ensure user type consistency with the superuser and manager flags.
+        
+        Call this explicitly before saving whenever the role fields may have
+        changed; it is deliberately not part of save() so that plain saves
+        stay cheap.
+        
+        Args:
+            user: The profile's User, if the caller already has it loaded.
+                Passing it avoids reading ``self.user`` across the foreign key.
+        """
+        if user is None:
+            user = self.user
+        
+        self.user_type, self.is_manager, self.is_normal_user = _USER_TYPE_TABLE[
+            (bool(user.is_superuser), bool(self.is_manager))
+        ]
     
     @property
     def full_name(self) -> str:
         """Get user's full name."""
         return f"{self.user.first_name} {self.user.last_name}".strip() or self.user.username
     
-    @property
+    @cached_property
     def user_directory_path(self) -> str:
         """Get the full path to user's directory."""
-        from django.conf import settings
-        import os
-        return os.path.join(settings.MASTER_DIR, self.dir_name)
+        return os.path.join(_MASTER_DIR, self.dir_name)
 
 
 @receiver(post_save, sender=User)
@@ -106,39 +194,109 @@ def create_user_profile(sender, instance, created, **kwargs):
         **kwargs: Additional keyword arguments
     """
     if created:
-        # Generate directory name based on username
-        dir_name = f"user_{instance.username}_{instance.id}"
-        
         # Create user profile
-        UserProfile.objects.create(
+        profile = UserProfile(
             user=instance,
-            dir_name=dir_name,
+            dir_name=build_dir_name(instance.username, instance.id),
             is_normal_user=True,
             is_manager=False
         )
-        logger.info(f"Created user profile for new user: {instance.username}")
+        profile.sync_user_type(instance)
+        profile.save()
+        logger.info("Created user profile for new user: %s", instance.username)
 
 
-@receiver(post_save, sender=User)
-def save_user_profile(sender, instance, **kwargs):
+def _user_cache_key(user_id: int) -> str:
+    """Build the cache key for a user and their profile."""
+    return f"auth_app:user:{user_id}"
+
+
+def get_cached_user(user_id: int) -> User:
     """
-    Signal handler to automatically save UserProfile when User is saved.
+    Get a user with their profile preloaded, caching the result briefly.
+    
+    Used by authentication so repeated requests from the same user skip the
+    user/profile query. Entries are dropped when the user or profile is
+    saved or deleted in this process, and expire after USER_CACHE_TIMEOUT
+    seconds elsewhere.
     
     Args:
-        sender: The User model class
-        instance: The User instance being saved
-        **kwargs: Additional keyword arguments
+        user_id: Primary key of the user
+        
+    Returns:
+        User: The user, with ``profile`` loaded if it exists
+        
+    Raises:
+        User.DoesNotExist: If no user has this primary key
     """
-    try:
-        instance.profile.save()
-        logger.debug(f"Saved user profile for user: {instance.username}")
-    except UserProfile.DoesNotExist:
-        # If profile doesn't exist, create it
-        dir_name = f"user_{instance.username}_{instance.id}"
-        UserProfile.objects.create(
-            user=instance,
-            dir_name=dir_name,
-            is_normal_user=True,
-            is_manager=False
-        )
-        logger.info(f"Created missing user profile for user: {instance.username}")
+    key = _user_cache_key(user_id)
+    user = cache.get(key)
+    if user is None:
+        user = User.objects.select_related('profile').get(pk=user_id)
+        cache.set(key, user, USER_CACHE_TIMEOUT)
+    return user
+
+
+def invalidate_cached_user(user_id: int) -> None:
+    """Drop a user from the authentication cache."""
+    cache.delete(_user_cache_key(user_id))
+
+
+@receiver([post_save, post_delete], sender=User)
+def invalidate_user_cache(sender, instance, **kwargs):
+    """Signal handler to drop a saved or deleted user from the cache."""
+    invalidate_cached_user(instance.pk)
+
+
+@receiver([post_save, post_delete], sender=UserProfile)
+def invalidate_profile_cache(sender, instance, **kwargs):
+    """Signal handler to drop a user from the cache when their profile changes."""
+    invalidate_cached_user(instance.user_id)
+
+
+def bulk_register_users(user_data_iter: Iterable[Dict[str, Any]]) -> List[User]:
+    """
+    Create many users and their profiles with two bulk INSERTs.
+    
+    ``bulk_create`` does not send ``post_save``, so ``create_user_profile``
+    is not triggered; the profiles are created here in one batch instead.
+    
+    Args:
+        user_data_iter: Iterable of dicts of User field values; an optional
+            ``password`` key is hashed with ``set_password``
+        
+    Returns:
+        List[User]: The created users
+    """
+    users = []
+    for user_data in user_data_iter:
+        user_data = dict(user_data)
+        password = user_data.pop('password', None)
+        user = User(**user_data)
+        if password:
+            user.set_password(password)
+        else:
+            user.set_unusable_password()
+        users.append(user)
+    
+    with transaction.atomic():
+        users = User.objects.bulk_create(users)
+        
+        # Backends that cannot return inserted ids need a refetch
+        if any(user.pk is None for user in users):
+            users = list(User.objects.filter(username__in=[user.username for user in users]))
+        
+        profiles = []
+        for user in users:
+            profile = UserProfile(
+                user=user,
+                dir_name=build_dir_name(user.username, user.id),
+                is_normal_user=True,
+                is_manager=False
+            )
+            profile.sync_user_type(user)
+            profiles.append(profile)
+        UserProfile.objects.bulk_create(profiles)
+    
+    logger.info("Bulk registered %s users", len(users))
+    return users
@@ -3,15 +3,41 @@ Serializers for auth app - user authentication and profile management.
 """
 from rest_framework import serializers
 from django.contrib.auth.models import User
-from django.contrib.auth.password_validation import validate_password
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.password_validation import password_changed, validate_password
 from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken, OutstandingToken
 from rest_framework_simplejwt.tokens import RefreshToken
-from .models import UserProfile
+from .models import UserProfile, build_dir_name, invalidate_cached_user
 import logging
 
 logger = logging.getLogger(__name__)
 
 
+def bulk_blacklist(user_id: int) -> int:
+    """
+    Blacklist all of a user's outstanding refresh tokens.
+    
+    Uses one SELECT and one bulk INSERT instead of calling
+    ``RefreshToken.blacklist()`` for each token.
+    
+    Args:
+        user_id: Primary key of the user
+        
+    Returns:
+        int: Number of tokens blacklisted
+    """
+    token_ids = OutstandingToken.objects.filter(
+        user_id=user_id, blacklistedtoken__isnull=True
+    ).values_list('id', flat=True)
+    blacklisted = BlacklistedToken.objects.bulk_create(
+        [BlacklistedToken(token_id=token_id) for token_id in token_ids],
+        ignore_conflicts=True
+    )
+    logger.info("Blacklisted %s refresh tokens for user id: %s", len(blacklisted), user_id)
+    return len(blacklisted)
+
+
 class CustomTokenObtainPairSerializer(TokenObtainPairSerializer):
     """
     Custom JWT token serializer that includes user profile information.
@@ -45,9 +71,9 @@ class CustomTokenObtainPairSerializer(TokenObtainPairSerializer):
                 'dir_name': profile.dir_name,
                 'full_name': profile.full_name,
             })
-            logger.info(f"User {user.username} logged in successfully")
+            logger.info("User %s logged in successfully", user.username)
         except UserProfile.DoesNotExist:
-            logger.warning(f"User {user.username} logged in but has no profile")
+            logger.warning("User %s logged in but has no profile", user.username)
             data.update({
                 'user_id': user.id,
                 'username': user.username,
@@ -59,7 +85,7 @@ class CustomTokenObtainPairSerializer(TokenObtainPairSerializer):
                 'is_manager': False,
                 'is_normal_user': True,
                 'user_type': 'normal',
-                'dir_name': f"user_{user.username}_{user.id}",
+                'dir_name': build_dir_name(user.username, user.id),
                 'full_name': user.get_full_name() or user.username,
             })
         
@@ -116,7 +142,7 @@ class UserRegistrationSerializer(serializers.ModelSerializer):
         
         # Create user
         user = User.objects.create_user(**validated_data)
-        logger.info(f"Created new user: {user.username}")
+        logger.info("Created new user: %s", user.username)
         
         return user
 
@@ -125,26 +151,38 @@ class UserProfileSerializer(serializers.ModelSerializer):
     """
     Serializer for user profile information.
     
-    Provides read/write access to user profile fields.
+    Provides read/write access to user profile fields. The read-only User
+    fields are copied from ``instance.user`` in a single pass rather than
+    declared as separate ``source='user.*'`` fields.
     """
     
-    username = serializers.CharField(source='user.username', read_only=True)
-    email = serializers.CharField(source='user.email', read_only=True)
-    first_name = serializers.CharField(source='user.first_name', read_only=True)
-    last_name = serializers.CharField(source='user.last_name', read_only=True)
-    is_superuser = serializers.BooleanField(source='user.is_superuser', read_only=True)
-    is_staff = serializers.BooleanField(source='user.is_staff', read_only=True)
+    # Read-only fields taken from the related User
+    user_fields = (
+        'username', 'email', 'first_name', 'last_name',
+        'is_superuser', 'is_staff'
+    )
     
     class Meta:
         """Meta options for UserProfileSerializer."""
         model = UserProfile
         fields = (
-            'id', 'username', 'email', 'first_name', 'last_name',
-            'is_superuser', 'is_staff', 'is_manager', 'is_normal_user',
+            'id', 'is_manager', 'is_normal_user',
             'user_type', 'dir_name', 'full_name', 'created_at', 'updated_at'
         )
         read_only_fields = ('id', 'created_at', 'updated_at', 'dir_name')
     
+    def to_representation(self, instance):
+        """Serialize the profile, inlining the related User fields."""
+        data = super().to_representation(instance)
+        user = instance.user
+        
+        representation = {'id': data.pop('id')}
+        for field in self.user_fields:
+            representation[field] = getattr(user, field)
+        representation.update(data)
+        
+        return representation
+    
     def update(self, instance, validated_data):
         """Update user profile with validation."""
         # Only allow managers and superusers to change user types
@@ -154,11 +192,14 @@ class UserProfileSerializer(serializers.ModelSerializer):
                 "is_manager": "Only managers and superusers can change user types."
             })
         
-        # Update the profile
-        updated_profile = super().update(instance, validated_data)
-        logger.info(f"Updated profile for user: {updated_profile.user.username}")
+        # Update the profile, reconciling the user type before saving
+        for attr, value in validated_data.items():
+            setattr(instance, attr, value)
+        instance.sync_user_type()
+        instance.save()
+        logger.info("Updated profile for user: %s", instance.user.username)
         
-        return updated_profile
+        return instance
 
 
 class ChangePasswordSerializer(serializers.Serializer):
@@ -198,9 +239,14 @@ class ChangePasswordSerializer(serializers.Serializer):
     def save(self):
         """Save the new password."""
         user = self.context['request'].user
-        user.set_password(self.validated_data['new_password'])
-        user.save()
-        logger.info(f"Password changed for user: {user.username}")
+        new_password = self.validated_data['new_password']
+        
+        # Write only the password column, bypassing User.save() and its signals
+        user.password = make_password(new_password)
+        User.objects.filter(pk=user.pk).update(password=user.password)
+        password_changed(new_password, user)
+        invalidate_cached_user(user.pk)
+        logger.info("Password changed for user: %s", user.username)
 
 
 class LogoutSerializer(serializers.Serializer):
@@ -214,16 +260,14 @@ class LogoutSerializer(serializers.Serializer):
     )
     
     def validate_refresh_token(self, value):
-        """Validate refresh token."""
+        """Validate refresh token and keep the parsed token for save()."""
         try:
-            RefreshToken(value)
+            self._token = RefreshToken(value)
             return value
         except Exception as e:
             raise serializers.ValidationError("Invalid refresh token.")
     
     def save(self):
         """Blacklist the refresh token."""
-        refresh_token = self.validated_data['refresh_token']
-        token = RefreshToken(refresh_token)
-        token.blacklist()
+        self._token.blacklist()
         logger.info("User logged out successfully") 
\ No newline at end of file
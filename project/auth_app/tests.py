@@ -1,3 +1,264 @@
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken, OutstandingToken
+from rest_framework_simplejwt.tokens import AccessToken, RefreshToken
+
+from .models import UserProfile, _user_cache_key, build_dir_name, bulk_register_users
+from .serializers import UserProfileSerializer, bulk_blacklist
+
+
+class UserProfileSaveTests(TestCase):
+    """save() writes only the changed tracked columns of a loaded profile."""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='carol', password='secret')
+
+    def save_and_capture(self, profile):
+        with CaptureQueriesContext(connection) as queries:
+            profile.save()
+        updates = [query['sql'] for query in queries if query['sql'].startswith('UPDATE')]
+        self.assertEqual(len(updates), 1)
+        return updates[0]
+
+    def test_tracked_fields_cover_every_column(self):
+        # A column left out of TRACKED_FIELDS would never be written by save()
+        columns = {
+            field.attname for field in UserProfile._meta.concrete_fields
+            if not field.primary_key and field.name not in ('created_at', 'updated_at')
+        }
+        self.assertEqual(set(UserProfile.TRACKED_FIELDS), columns)
+
+    def test_changed_field_is_saved(self):
+        profile = UserProfile.objects.get(user=self.user)
+        profile.is_manager = True
+        profile.sync_user_type(self.user)
+
+        sql = self.save_and_capture(profile)
+
+        self.assertIn('"is_manager"', sql)
+        self.assertIn('"user_type"', sql)
+        self.assertNotIn('"dir_name"', sql)
+        profile = UserProfile.objects.get(user=self.user)
+        self.assertTrue(profile.is_manager)
+        self.assertEqual(profile.user_type, 'manager')
+
+    def test_unchanged_save_writes_timestamp_only(self):
+        profile = UserProfile.objects.get(user=self.user)
+        updated_at = profile.updated_at
+
+        sql = self.save_and_capture(profile)
+
+        self.assertIn('"updated_at"', sql)
+        for field in UserProfile.TRACKED_FIELDS:
+            self.assertNotIn(f'"{field}"', sql)
+        self.assertGreater(UserProfile.objects.get(user=self.user).updated_at, updated_at)
+
+    def test_fresh_instance_is_saved_whole(self):
+        UserProfile.objects.filter(user=self.user).delete()
+        profile = UserProfile(user=self.user, dir_name='custom_dir', is_manager=True, is_normal_user=False, user_type='manager')
+
+        profile.save()
+
+        stored = UserProfile.objects.get(user=self.user)
+        self.assertEqual(
+            (stored.dir_name, stored.is_manager, stored.is_normal_user, stored.user_type),
+            ('custom_dir', True, False, 'manager')
+        )
+
+        # Changes after the first save are tracked against the saved values
+        profile.user_type = 'normal'
+        sql = self.save_and_capture(profile)
+        self.assertIn('"user_type"', sql)
+        self.assertNotIn('"is_manager"', sql)
+        self.assertEqual(UserProfile.objects.get(user=self.user).user_type, 'normal')
+
+
+class BulkRegisterUsersTests(TestCase):
+    """bulk_register_users creates users and their profiles in bulk."""
+
+    def test_creates_users_with_profiles(self):
+        users = bulk_register_users([
+            {'username': 'dave', 'email': 'dave@example.com', 'password': 'secret'},
+            {'username': 'erin'},
+        ])
+
+        self.assertEqual([user.username for user in users], ['dave', 'erin'])
+        for user in users:
+            profile = UserProfile.objects.get(user=user)
+            self.assertEqual(profile.dir_name, build_dir_name(user.username, user.id))
+            self.assertEqual(profile.user_type, 'normal')
+            self.assertTrue(profile.is_normal_user)
+        self.assertTrue(User.objects.get(username='dave').check_password('secret'))
+        self.assertFalse(User.objects.get(username='erin').has_usable_password())
+
+    def test_does_not_modify_input(self):
+        user_data = {'username': 'frank', 'password': 'secret'}
+
+        bulk_register_users([user_data])
+
+        self.assertEqual(user_data, {'username': 'frank', 'password': 'secret'})
+
+
+class BulkBlacklistTests(TestCase):
+    """bulk_blacklist blacklists every outstanding refresh token of a user."""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='gina', password='secret')
+        self.other = User.objects.create_user(username='hank', password='secret')
+
+    def test_blacklists_outstanding_tokens(self):
+        tokens = [RefreshToken.for_user(self.user) for _ in range(3)]
+        RefreshToken.for_user(self.other)
+        tokens[0].blacklist()
+
+        self.assertEqual(bulk_blacklist(self.user.id), 2)
+
+        self.assertEqual(
+            BlacklistedToken.objects.filter(token__user=self.user).count(),
+            OutstandingToken.objects.filter(user=self.user).count()
+        )
+        self.assertFalse(BlacklistedToken.objects.filter(token__user=self.other).exists())
+
+    def test_nothing_to_blacklist(self):
+        RefreshToken.for_user(self.user)
+        bulk_blacklist(self.user.id)
+
+        self.assertEqual(bulk_blacklist(self.user.id), 0)
+
+
+class UserListViewTests(TestCase):
+    """The user list must format each user like UserProfileSerializer."""
+
+    def setUp(self):
+        self.admin = User.objects.create_superuser(username='admin', password='secret')
+        User.objects.create_user(username='bob', password='secret', first_name='Bob')
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+
+    def test_entries_match_serializer(self):
+        response = self.client.get('/api/auth/users/')
+
+        self.assertEqual(response.status_code, 200)
+        expected = {
+            user.profile.id: UserProfileSerializer(user.profile).data
+            for user in User.objects.select_related('profile')
+        }
+        results = response.json()['results']
+        self.assertEqual(len(results), len(expected))
+        for entry in results:
+            self.assertEqual(entry, dict(expected[entry['id']]))
+
+    def test_normal_user_gets_empty_list(self):
+        self.client.force_authenticate(User.objects.get(username='bob'))
+
+        response = self.client.get('/api/auth/users/')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['results'], [])
+
+
+# Rejects access tokens issued before the user's password last changed.
+# Patched on the settings object itself: simplejwt's modules keep the one
+# they imported, so override_settings(SIMPLE_JWT=...) would not reach them
+REVOKE_ON_PASSWORD_CHANGE = mock.patch.object(jwt_settings, 'CHECK_REVOKE_TOKEN', True)
+
+
+class CachedUserTestCase(TestCase):
+    """Base case authenticating with real access tokens through the user cache."""
+
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        self.user = User.objects.create_user(username='ivan', password='Old-pass-123')
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {AccessToken.for_user(self.user)}')
+
+    def user_info(self):
+        return self.client.get('/api/auth/user-info/')
+
+    def is_cached(self):
+        return cache.get(_user_cache_key(self.user.id)) is not None
+
+
+class CachedUserInvalidationTests(CachedUserTestCase):
+    """Saving a user or profile drops the cached user at once."""
+
+    def test_authenticated_user_is_cached(self):
+        self.assertEqual(self.user_info().status_code, 200)
+        self.assertTrue(self.is_cached())
+
+    def test_deactivated_user_is_rejected(self):
+        self.assertEqual(self.user_info().status_code, 200)
+
+        self.user.is_active = False
+        self.user.save()
+
+        self.assertFalse(self.is_cached())
+        self.assertEqual(self.user_info().status_code, 401)
+
+    @REVOKE_ON_PASSWORD_CHANGE
+    def test_password_saved_on_user_is_rejected(self):
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {AccessToken.for_user(self.user)}')
+        self.assertEqual(self.user_info().status_code, 200)
+
+        self.user.set_password('New-pass-456')
+        self.user.save()
+
+        self.assertFalse(self.is_cached())
+        self.assertEqual(self.user_info().status_code, 401)
+
+    def test_profile_change_is_seen(self):
+        self.assertEqual(self.user_info().json()['user_type'], 'normal')
+
+        profile = UserProfile.objects.get(user=self.user)
+        profile.is_manager = True
+        profile.sync_user_type(self.user)
+        profile.save()
+
+        self.assertFalse(self.is_cached())
+        self.assertEqual(self.user_info().json()['user_type'], 'manager')
+
+
+class ChangePasswordTests(CachedUserTestCase):
+    """ChangePasswordSerializer.save swaps the password and drops the cached user."""
+
+    def change_password(self, old_password='Old-pass-123', new_password='New-pass-456'):
+        return self.client.post('/api/auth/change-password/', {
+            'old_password': old_password,
+            'new_password': new_password,
+            'new_password2': new_password,
+        })
+
+    def login(self, password):
+        return APIClient().post('/api/auth/login/', {'username': 'ivan', 'password': password})
+
+    @REVOKE_ON_PASSWORD_CHANGE
+    def test_password_is_changed(self):
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {AccessToken.for_user(self.user)}')
+        self.assertEqual(self.user_info().status_code, 200)
+        self.assertTrue(self.is_cached())
+
+        response = self.change_password()
+
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(self.is_cached())
+        user = User.objects.get(pk=self.user.pk)
+        self.assertTrue(user.check_password('New-pass-456'))
+        self.assertFalse(user.check_password('Old-pass-123'))
+        self.assertEqual(self.login('New-pass-456').status_code, 200)
+        self.assertEqual(self.login('Old-pass-123').status_code, 401)
+        # Tokens issued before the change are no longer accepted
+        self.assertEqual(self.user_info().status_code, 401)
+
+    def test_wrong_old_password_changes_nothing(self):
+        response = self.change_password(old_password='Wrong-pass-789')
 
-# Create your tests here.
+        self.assertEqual(response.status_code, 400)
+        self.assertTrue(User.objects.get(pk=self.user.pk).check_password('Old-pass-123'))
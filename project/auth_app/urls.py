@@ -10,6 +10,7 @@ from .views import (
     UserProfileView,
     ChangePasswordView,
     LogoutView,
+    LogoutAllView,
     UserListView,
     user_info,
     test_auth
@@ -22,6 +23,7 @@ urlpatterns = [
     path('login/', CustomTokenObtainPairView.as_view(), name='login'),
     path('token/refresh/', TokenRefreshView.as_view(), name='token_refresh'),
     path('logout/', LogoutView.as_view(), name='logout'),
+    path('logout-all/', LogoutAllView.as_view(), name='logout_all'),
     
     # User Management
     path('register/', UserRegistrationView.as_view(), name='register'),
@@ -3,6 +3,7 @@ Views for auth app - user authentication and profile management.
 """
 from rest_framework import status, generics, permissions
 from rest_framework.decorators import api_view, permission_classes
+from rest_framework.pagination import CursorPagination
 from rest_framework.response import Response
 from rest_framework.views import APIView
 from rest_framework_simplejwt.views import TokenObtainPairView, TokenRefreshView
@@ -10,6 +11,8 @@ from django.contrib.auth.models import User
 from django.contrib.auth import authenticate
 from django.conf import settings
 import logging
+import os
+import threading
 
 from .models import UserProfile
 from .serializers import (
@@ -17,7 +20,8 @@ from .serializers import (
     UserRegistrationSerializer,
     UserProfileSerializer,
     ChangePasswordSerializer,
-    LogoutSerializer
+    LogoutSerializer,
+    bulk_blacklist
 )
 
 logger = logging.getLogger(__name__)
@@ -25,6 +29,23 @@ logger = logging.getLogger(__name__)
 REGISTRATION_ENABLED = False  # Set to True to enable registration
 
 
+def _create_user_directory(user_dir: str) -> None:
+    """
+    Create a newly registered user's directory.
+    
+    Runs on a background thread so registration does not wait on the
+    filesystem; file manager views create the directory on demand anyway.
+    
+    Args:
+        user_dir: Full path of the directory to create
+    """
+    try:
+        os.makedirs(user_dir, exist_ok=True)
+        logger.info("Created user directory: %s", user_dir)
+    except OSError as e:
+        logger.error("Failed to create user directory %s: %s", user_dir, e)
+
+
 class CustomTokenObtainPairView(TokenObtainPairView):
     """
     Custom JWT token obtain view with enhanced user information.
@@ -39,10 +60,10 @@ class CustomTokenObtainPairView(TokenObtainPairView):
         """Handle login request with enhanced logging."""
         try:
             response = super().post(request, *args, **kwargs)
-            logger.info(f"Login successful for user: {request.data.get('username', 'unknown')}")
+            logger.info("Login successful for user: %s", request.data.get('username', 'unknown'))
             return response
         except Exception as e:
-            logger.error(f"Login failed for user: {request.data.get('username', 'unknown')} - {str(e)}")
+            logger.error("Login failed for user: %s - %s", request.data.get('username', 'unknown'), e)
             raise
 
 
@@ -72,11 +93,11 @@ class UserRegistrationView(generics.CreateAPIView):
             # Get the created profile
             profile = user.profile
             
-            # Create user directory
-            import os
+            # Create user directory off the request path
             user_dir = os.path.join(settings.MASTER_DIR, profile.dir_name)
-            os.makedirs(user_dir, exist_ok=True)
-            logger.info(f"Created user directory: {user_dir}")
+            threading.Thread(
+                target=_create_user_directory, args=(user_dir,), daemon=True
+            ).start()
             
             return Response({
                 'message': 'User registered successfully',
@@ -86,7 +107,7 @@ class UserRegistrationView(generics.CreateAPIView):
             }, status=status.HTTP_201_CREATED)
             
         except Exception as e:
-            logger.error(f"User registration failed: {str(e)}")
+            logger.error("User registration failed: %s", e)
             return Response({
                 'error': 'Registration failed',
                 'details': str(e)
@@ -112,10 +133,10 @@ class UserProfileView(generics.RetrieveUpdateAPIView):
         try:
             profile = self.get_object()
             serializer = self.get_serializer(profile)
-            logger.debug(f"Profile retrieved for user: {request.user.username}")
+            logger.debug("Profile retrieved for user: %s", request.user.username)
             return Response(serializer.data)
         except UserProfile.DoesNotExist:
-            logger.warning(f"Profile not found for user: {request.user.username}")
+            logger.warning("Profile not found for user: %s", request.user.username)
             return Response({
                 'error': 'Profile not found'
             }, status=status.HTTP_404_NOT_FOUND)
@@ -127,10 +148,10 @@ class UserProfileView(generics.RetrieveUpdateAPIView):
             serializer = self.get_serializer(profile, data=request.data, partial=True)
             serializer.is_valid(raise_exception=True)
             serializer.save()
-            logger.info(f"Profile updated for user: {request.user.username}")
+            logger.info("Profile updated for user: %s", request.user.username)
             return Response(serializer.data)
         except Exception as e:
-            logger.error(f"Profile update failed for user: {request.user.username} - {str(e)}")
+            logger.error("Profile update failed for user: %s - %s", request.user.username, e)
             return Response({
                 'error': 'Profile update failed',
                 'details': str(e)
@@ -153,13 +174,13 @@ class ChangePasswordView(APIView):
             serializer.is_valid(raise_exception=True)
             serializer.save()
             
-            logger.info(f"Password changed for user: {request.user.username}")
+            logger.info("Password changed for user: %s", request.user.username)
             return Response({
                 'message': 'Password changed successfully'
             }, status=status.HTTP_200_OK)
             
         except Exception as e:
-            logger.error(f"Password change failed for user: {request.user.username} - {str(e)}")
+            logger.error("Password change failed for user: %s - %s", request.user.username, e)
             return Response({
                 'error': 'Password change failed',
                 'details': str(e)
@@ -182,28 +203,91 @@ class LogoutView(APIView):
             serializer.is_valid(raise_exception=True)
             serializer.save()
             
-            logger.info(f"User logged out: {request.user.username}")
+            logger.info("User logged out: %s", request.user.username)
             return Response({
                 'message': 'Logged out successfully'
             }, status=status.HTTP_200_OK)
             
         except Exception as e:
-            logger.error(f"Logout failed for user: {request.user.username} - {str(e)}")
+            logger.error("Logout failed for user: %s - %s", request.user.username, e)
+            return Response({
+                'error': 'Logout failed',
+                'details': str(e)
+            }, status=status.HTTP_400_BAD_REQUEST)
+
+
+class LogoutAllView(APIView):
+    """
+    View for logging out of all sessions.
+    
+    Blacklists every outstanding refresh token of the current user.
+    """
+    
+    permission_classes = [permissions.IsAuthenticated]
+    
+    def post(self, request):
+        """Logout user everywhere by blacklisting all refresh tokens."""
+        try:
+            count = bulk_blacklist(request.user.id)
+            
+            logger.info("User logged out of all sessions: %s", request.user.username)
+            return Response({
+                'message': 'Logged out of all sessions successfully',
+                'sessions_closed': count
+            }, status=status.HTTP_200_OK)
+            
+        except Exception as e:
+            logger.error("Logout all failed for user: %s - %s", request.user.username, e)
             return Response({
                 'error': 'Logout failed',
                 'details': str(e)
             }, status=status.HTTP_400_BAD_REQUEST)
 
 
+class UserListPagination(CursorPagination):
+    """
+    Cursor pagination for the user list, newest profiles first.
+    
+    Cursors seek on the indexed ``created_at`` column, so deep pages cost
+    the same as the first one.
+    """
+    
+    ordering = '-created_at'
+    page_size = 50
+    page_size_query_param = 'page_size'
+    max_page_size = 200
+
+
 class UserListView(generics.ListAPIView):
     """
     View for listing users (managers and superusers only).
     
-    Provides a list of all users with their profile information.
+    Provides a list of all users with their profile information. The list is
+    built from ``.values()`` rows rather than from model instances; each value
+    is formatted by the matching UserProfileSerializer field, so entries match
+    the single-profile endpoint.
     """
     
     serializer_class = UserProfileSerializer
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = UserListPagination
+    
+    # Columns read for each listed user, as (lookup, response key) pairs
+    list_fields = (
+        ('id', 'id'),
+        ('user__username', 'username'),
+        ('user__email', 'email'),
+        ('user__first_name', 'first_name'),
+        ('user__last_name', 'last_name'),
+        ('user__is_superuser', 'is_superuser'),
+        ('user__is_staff', 'is_staff'),
+        ('is_manager', 'is_manager'),
+        ('is_normal_user', 'is_normal_user'),
+        ('user_type', 'user_type'),
+        ('dir_name', 'dir_name'),
+        ('created_at', 'created_at'),
+        ('updated_at', 'updated_at'),
+    )
     
     def get_queryset(self):
         """Get queryset based on user permissions."""
@@ -211,11 +295,39 @@ class UserListView(generics.ListAPIView):
         
         # Only managers and superusers can list users
         if not (user.is_superuser or user.profile.is_manager):
-            logger.warning(f"Unauthorized access attempt to user list by: {user.username}")
+            logger.warning("Unauthorized access attempt to user list by: %s", user.username)
             return UserProfile.objects.none()
         
-        logger.info(f"User list accessed by: {user.username}")
-        return UserProfile.objects.all().select_related('user')
+        logger.info("User list accessed by: %s", user.username)
+        return UserProfile.objects.order_by('-created_at')
+    
+    def list(self, request, *args, **kwargs):
+        """List users from plain value rows, skipping per-instance serialization."""
+        rows = self.paginate_queryset(
+            self.get_queryset().values(*(lookup for lookup, _ in self.list_fields))
+        )
+        
+        # Formatters of the serializer's own fields; the User fields it
+        # copies as-is have none
+        fields = self.get_serializer().fields
+        formatters = [
+            (lookup, key, fields[key].to_representation if key in fields else None)
+            for lookup, key in self.list_fields
+        ]
+        
+        users = []
+        for row in rows:
+            user_data = {}
+            for lookup, key, to_representation in formatters:
+                value = row[lookup]
+                user_data[key] = value if to_representation is None or value is None else to_representation(value)
+            user_data['full_name'] = (
+                f"{user_data['first_name']} {user_data['last_name']}".strip()
+                or user_data['username']
+            )
+            users.append(user_data)
+        
+        return self.get_paginated_response(users)
 
 
 @api_view(['GET'])
@@ -225,6 +337,8 @@ def user_info(request):
     Get current user information.
     
     Returns detailed information about the currently authenticated user.
+    The profile is loaded together with the user by ProfileJWTAuthentication,
+    so building the response issues no further queries.
     """
     try:
         user = request.user
@@ -247,16 +361,16 @@ def user_info(request):
             'updated_at': profile.updated_at,
         }
         
-        logger.debug(f"User info retrieved for: {user.username}")
+        logger.debug("User info retrieved for: %s", user.username)
         return Response(data)
         
     except UserProfile.DoesNotExist:
-        logger.warning(f"Profile not found for user: {request.user.username}")
+        logger.warning("Profile not found for user: %s", request.user.username)
         return Response({
             'error': 'Profile not found'
         }, status=status.HTTP_404_NOT_FOUND)
     except Exception as e:
-        logger.error(f"Error retrieving user info for {request.user.username}: {str(e)}")
+        logger.error("Error retrieving user info for %s: %s", request.user.username, e)
         return Response({
             'error': 'Failed to retrieve user information',
             'details': str(e)
@@ -271,7 +385,7 @@ def test_auth(request):
     
     Simple endpoint to test if JWT authentication is working.
     """
-    logger.debug(f"Auth test endpoint accessed by: {request.user.username}")
+    logger.debug("Auth test endpoint accessed by: %s", request.user.username)
     return Response({
         'message': 'Authentication successful',
         'user': request.user.username,
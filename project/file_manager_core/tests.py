@@ -1,3 +1,419 @@
-from django.test import TestCase
+import datetime
+import io
+import os
+import shutil
+import tempfile
+import zipfile
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock, skipIf
 
-# Create your tests here.
+from django.contrib.auth.models import User
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, override_settings
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+
+from . import views
+from .renderers import ORJSONRenderer, orjson
+from .views import _clone_or_copy_range, _copy_file, _parallel_rmtree, _resolve_user_dir, _stream_zip, get_user_directory, validate_path_security
+
+
+@skipIf(orjson is None, "orjson is not installed")
+class ORJSONRendererTests(TestCase):
+    """ORJSONRenderer must produce the same bodies as DRF's JSONRenderer."""
+
+    def test_matches_json_renderer(self):
+        data = {
+            "name": "report.txt",
+            "size": 1024,
+            "created_at": datetime.datetime(2026, 10, 14, 23, 31, 14, 288973, tzinfo=datetime.timezone.utc),
+            "modified": datetime.datetime(2026, 1, 1, 12, 0),
+            "items": [{"name": "é"}],
+        }
+        self.assertEqual(ORJSONRenderer().render(data), JSONRenderer().render(data))
+
+    def test_utc_datetime_uses_z_suffix(self):
+        data = {"created_at": datetime.datetime(2026, 10, 14, 23, 31, 14, tzinfo=datetime.timezone.utc)}
+        self.assertEqual(ORJSONRenderer().render(data), b'{"created_at":"2026-10-14T23:31:14Z"}')
+
+
+class FileManagerTestCase(TestCase):
+    """Base case giving each test an authenticated user and a scratch MASTER_DIR."""
+
+    def setUp(self):
+        master_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, master_dir)
+        settings_override = override_settings(MASTER_DIR=master_dir)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        _resolve_user_dir.cache_clear()
+
+        self.user = User.objects.create_user(username='alice', password='secret')
+        self.user_dir = get_user_directory(self.user)
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+
+class SymlinkTests(FileManagerTestCase):
+    """Operations on a symlink must act on the link, not on its target."""
+
+    def setUp(self):
+        super().setUp()
+        self.target = os.path.join(self.user_dir, 'target')
+        os.makedirs(self.target)
+        with open(os.path.join(self.target, 'keep.txt'), 'w') as f:
+            f.write('keep')
+        os.symlink(self.target, os.path.join(self.user_dir, 'link'))
+
+    def test_delete_removes_link_only(self):
+        response = self.client.post('/api/files/delete/', {'path': 'link'})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(os.path.lexists(os.path.join(self.user_dir, 'link')))
+        self.assertTrue(os.path.isfile(os.path.join(self.target, 'keep.txt')))
+
+    def test_rename_renames_link(self):
+        response = self.client.post('/api/files/rename/', {'old_path': 'link', 'new_name': 'renamed'})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(os.path.islink(os.path.join(self.user_dir, 'renamed')))
+        self.assertTrue(os.path.isdir(self.target))
+
+    def test_link_outside_can_be_deleted_but_not_read(self):
+        outside = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, outside)
+        os.symlink(outside, os.path.join(self.user_dir, 'escape'))
+
+        response = self.client.get('/api/files/list/', {'path': 'escape'})
+        self.assertEqual(response.status_code, 403)
+
+        response = self.client.post('/api/files/delete/', {'path': 'escape'})
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(os.path.isdir(outside))
+
+    def test_parent_traversal_is_rejected(self):
+        with self.assertRaises(ValueError):
+            validate_path_security(self.user_dir, os.path.join(self.user_dir, '..', 'other'))
+
+
+class ParallelRmtreeTests(TestCase):
+    """_parallel_rmtree removes a whole tree but never follows symlinks."""
+
+    def setUp(self):
+        self.base = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.base)
+
+    def test_deletes_nested_tree(self):
+        root = os.path.join(self.base, 'root')
+        for depth in range(4):
+            level = os.path.join(root, *(f'd{i}' for i in range(depth)))
+            os.makedirs(os.path.join(level, 'empty'))
+            for i in range(5):
+                with open(os.path.join(level, f'f{i}.txt'), 'w') as f:
+                    f.write('data')
+
+        _parallel_rmtree(root)
+
+        self.assertFalse(os.path.lexists(root))
+        self.assertEqual(os.listdir(self.base), [])
+
+    def test_links_are_unlinked_not_followed(self):
+        outside = os.path.join(self.base, 'outside')
+        os.makedirs(outside)
+        with open(os.path.join(outside, 'keep.txt'), 'w') as f:
+            f.write('keep')
+        root = os.path.join(self.base, 'root')
+        os.makedirs(os.path.join(root, 'sub'))
+        os.symlink(outside, os.path.join(root, 'sub', 'dir_link'))
+        os.symlink(os.path.join(outside, 'keep.txt'), os.path.join(root, 'file_link'))
+
+        _parallel_rmtree(root)
+
+        self.assertFalse(os.path.lexists(root))
+        self.assertTrue(os.path.isfile(os.path.join(outside, 'keep.txt')))
+
+    def test_delete_endpoint_removes_folder(self):
+        user = User.objects.create_user(username='dan', password='secret')
+        with override_settings(MASTER_DIR=self.base):
+            _resolve_user_dir.cache_clear()
+            self.addCleanup(_resolve_user_dir.cache_clear)
+            user_dir = get_user_directory(user)
+            os.makedirs(os.path.join(user_dir, 'docs', 'old', 'older'))
+            with open(os.path.join(user_dir, 'docs', 'old', 'older', 'a.txt'), 'w') as f:
+                f.write('a')
+            client = APIClient()
+            client.force_authenticate(user)
+
+            response = client.post('/api/files/delete/', {'path': 'docs'})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(os.listdir(user_dir), [])
+
+
+class StreamZipTests(FileManagerTestCase):
+    """A streamed ZIP must read back with the folder's files and contents."""
+
+    def setUp(self):
+        super().setUp()
+        self.folder = os.path.join(self.user_dir, 'album')
+        self.files = {
+            'notes.txt': b'hello world\n' * 100,
+            'photo.jpg': os.urandom(5000),
+            os.path.join('sub', 'empty.txt'): b'',
+            os.path.join('sub', 'deeper', 'data.csv'): b'a,b,c\n1,2,3\n' * 50,
+        }
+        for name, content in self.files.items():
+            path = os.path.join(self.folder, name)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, 'wb') as f:
+                f.write(content)
+
+    def assertArchiveMatches(self, data):
+        with zipfile.ZipFile(io.BytesIO(data)) as archive:
+            self.assertIsNone(archive.testzip())
+            self.assertEqual(sorted(archive.namelist()), sorted(self.files))
+            for name, content in self.files.items():
+                self.assertEqual(archive.read(name), content)
+            # Already-compressed formats are stored as-is
+            self.assertEqual(archive.getinfo('photo.jpg').compress_type, zipfile.ZIP_STORED)
+            self.assertEqual(archive.getinfo('notes.txt').compress_type, zipfile.ZIP_DEFLATED)
+
+    def test_archive_matches_folder(self):
+        # A small chunk size makes every file span several reads
+        with mock.patch.object(views, 'ZIP_STREAM_CHUNK_SIZE', 64):
+            data = b''.join(_stream_zip(self.folder))
+
+        self.assertArchiveMatches(data)
+
+    def test_deflates_at_configured_level(self):
+        data = b''.join(_stream_zip(self.folder))
+
+        compressor = zlib.compressobj(views.ZIP_COMPRESS_LEVEL, zlib.DEFLATED, -zlib.MAX_WBITS)
+        expected = compressor.compress(self.files['notes.txt']) + compressor.flush()
+        with zipfile.ZipFile(io.BytesIO(data)) as archive:
+            self.assertEqual(archive.getinfo('notes.txt').compress_size, len(expected))
+
+    def test_closing_early_stops_writer(self):
+        executor = ThreadPoolExecutor(max_workers=1)
+        self.addCleanup(executor.shutdown)
+        with mock.patch.object(views, '_zip_executor', return_value=executor), \
+                mock.patch.object(views, 'ZIP_STREAM_CHUNK_SIZE', 64), \
+                mock.patch.object(views, 'ZIP_STREAM_QUEUE_SIZE', 1):
+            stream = _stream_zip(self.folder)
+            next(stream)
+            stream.close()
+
+            # The single worker is free again only once the writer gave up
+            executor.submit(lambda: None).result(timeout=5)
+
+    def test_download_zip_endpoint(self):
+        response = self.client.get('/api/files/download-zip/', {'path': 'album'})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'application/zip')
+        self.assertArchiveMatches(b''.join(response.streaming_content))
+
+
+class DownloadFileTests(TestCase):
+    """_DownloadFile treats readahead hints as optional and never leaks its fd."""
+
+    def setUp(self):
+        fd, self.path = tempfile.mkstemp()
+        os.write(fd, b'content')
+        os.close(fd)
+        self.addCleanup(os.remove, self.path)
+
+    @skipIf(not hasattr(os, 'posix_fadvise'), "posix_fadvise is not available")
+    def test_refused_hints_are_ignored(self):
+        with mock.patch.object(views.os, 'posix_fadvise', side_effect=OSError) as fadvise, \
+                mock.patch.object(views, 'DOWNLOAD_READAHEAD_SIZE', 1):
+            with views._DownloadFile(self.path) as f:
+                self.assertEqual(f.read(), b'content')
+
+        self.assertEqual(fadvise.call_count, 3)
+
+    def test_closed_when_setup_fails(self):
+        opened = []
+        real_fstat = os.fstat
+
+        def failing_fstat(fd):
+            opened.append(fd)
+            raise OSError('fstat failed')
+
+        with mock.patch.object(views.os, 'fstat', side_effect=failing_fstat):
+            with self.assertRaises(OSError):
+                views._DownloadFile(self.path)
+
+        with self.assertRaises(OSError):
+            real_fstat(opened[0])
+
+
+class ConditionalResponseTests(FileManagerTestCase):
+    """Downloads and listings answer 304 while unchanged, 200 once changed."""
+
+    def setUp(self):
+        super().setUp()
+        self.file_path = os.path.join(self.user_dir, 'report.txt')
+        self.write_file(b'first version', mtime=1_700_000_000)
+
+    def write_file(self, content, mtime):
+        with open(self.file_path, 'wb') as f:
+            f.write(content)
+        os.utime(self.file_path, (mtime, mtime))
+
+    def download(self, **headers):
+        response = self.client.get('/api/files/download/', {'path': 'report.txt'}, **headers)
+        content = b''.join(response.streaming_content) if response.streaming else response.content
+        response.close()
+        return response, content
+
+    def test_download_not_modified(self):
+        response, content = self.download()
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(content, b'first version')
+        etag, last_modified = response['ETag'], response['Last-Modified']
+
+        for headers in ({'HTTP_IF_NONE_MATCH': etag}, {'HTTP_IF_MODIFIED_SINCE': last_modified}):
+            with self.subTest(headers=headers):
+                response, content = self.download(**headers)
+                self.assertEqual(response.status_code, 304)
+                self.assertEqual(content, b'')
+
+    def test_download_after_change(self):
+        response, _ = self.download()
+        etag, last_modified = response['ETag'], response['Last-Modified']
+        self.write_file(b'second version', mtime=1_700_000_100)
+
+        for headers in ({'HTTP_IF_NONE_MATCH': etag}, {'HTTP_IF_MODIFIED_SINCE': last_modified}):
+            with self.subTest(headers=headers):
+                response, content = self.download(**headers)
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(content, b'second version')
+                self.assertNotEqual(response['ETag'], etag)
+
+    def test_listing_not_modified(self):
+        response = self.client.get('/api/files/list/')
+        self.assertEqual(response.status_code, 200)
+        etag = response['ETag']
+        self.assertTrue(etag.startswith('W/'))
+
+        response = self.client.get('/api/files/list/', HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.content, b'')
+
+    def test_listing_after_change(self):
+        etag = self.client.get('/api/files/list/')['ETag']
+
+        # Rewriting a file leaves the folder's own mtime alone
+        self.write_file(b'a longer second version', mtime=1_700_000_100)
+        response = self.client.get('/api/files/list/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+
+        etag = response['ETag']
+        os.makedirs(os.path.join(self.user_dir, 'new_folder'))
+        response = self.client.get('/api/files/list/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+        self.assertIn('new_folder', [item['name'] for item in response.json()['items']])
+
+
+class MultiFileUploadTests(FileManagerTestCase):
+    """A multi-file upload is all or nothing when a name is already taken."""
+
+    def setUp(self):
+        super().setUp()
+        with open(os.path.join(self.user_dir, 'taken.txt'), 'wb') as f:
+            f.write(b'original')
+
+    def upload(self, names):
+        files = [SimpleUploadedFile(name, name.encode() * 100) for name in names]
+        return self.client.post('/api/files/upload/', {'files': files}, format='multipart')
+
+    def test_uploads_every_file(self):
+        names = [f'file{i}.txt' for i in range(5)]
+
+        response = self.upload(names)
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual([item['name'] for item in response.json()['files']], names)
+        for name in names:
+            with open(os.path.join(self.user_dir, name), 'rb') as f:
+                self.assertEqual(f.read(), name.encode() * 100)
+
+    def test_existing_name_writes_nothing(self):
+        names = ['new0.txt', 'new1.txt', 'taken.txt', 'new2.txt', 'new3.txt']
+
+        # Below and at the threshold the names are checked on disk and
+        # against one listing of the folder respectively
+        for threshold in (len(names) + 1, len(names)):
+            with self.subTest(threshold=threshold):
+                with mock.patch.object(views, 'UPLOAD_LISTING_THRESHOLD', threshold):
+                    response = self.upload(names)
+
+                self.assertEqual(response.status_code, 409)
+                self.assertEqual(response.json()['error'], 'File taken.txt already exists')
+                self.assertEqual(os.listdir(self.user_dir), ['taken.txt'])
+                with open(os.path.join(self.user_dir, 'taken.txt'), 'rb') as f:
+                    self.assertEqual(f.read(), b'original')
+
+    def test_repeated_name_writes_nothing(self):
+        response = self.upload(['a.txt', 'b.txt', 'a.txt'])
+
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(os.listdir(self.user_dir), ['taken.txt'])
+
+
+@skipIf(views.fcntl is None, "fcntl is not available")
+class CopyFileTests(TestCase):
+    """_copy_file falls back from FICLONE to copy_file_range to shutil.copy2."""
+
+    def setUp(self):
+        self.base = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.base)
+        self.src = os.path.join(self.base, 'src.bin')
+        self.dst = os.path.join(self.base, 'dst.bin')
+        self.content = os.urandom(100_000)
+        with open(self.src, 'wb') as f:
+            f.write(self.content)
+        os.utime(self.src, (1_700_000_000, 1_700_000_000))
+
+    def copy(self):
+        with mock.patch.object(shutil, 'copy2', wraps=shutil.copy2) as copy2:
+            self.assertEqual(_copy_file(self.src, self.dst), self.dst)
+        with open(self.dst, 'rb') as f:
+            self.assertEqual(f.read(), self.content)
+        self.assertEqual(os.stat(self.dst).st_mtime, 1_700_000_000)
+        return copy2
+
+    @skipIf(not hasattr(os, 'copy_file_range'), "copy_file_range is not available")
+    def test_copy_file_range_after_failed_clone(self):
+        with mock.patch.object(views.fcntl, 'ioctl', side_effect=OSError) as ioctl, \
+                mock.patch.object(views.os, 'copy_file_range', wraps=os.copy_file_range) as copy_range:
+            copy2 = self.copy()
+
+        ioctl.assert_called_once()
+        self.assertTrue(copy_range.called)
+        copy2.assert_not_called()
+
+    def test_copy2_after_failed_kernel_copies(self):
+        with mock.patch.object(views.fcntl, 'ioctl', side_effect=OSError) as ioctl, \
+                mock.patch.object(views.os, 'copy_file_range', side_effect=OSError) as copy_range:
+            copy2 = self.copy()
+
+        ioctl.assert_called_once()
+        copy_range.assert_called_once()
+        copy2.assert_called_once()
+
+    @skipIf(not hasattr(os, 'mkfifo'), "FIFOs are not supported")
+    def test_non_regular_file_is_not_opened(self):
+        fifo = os.path.join(self.base, 'fifo')
+        os.mkfifo(fifo)
+
+        with mock.patch.object(views.fcntl, 'ioctl') as ioctl:
+            self.assertFalse(_clone_or_copy_range(fifo, self.dst))
+
+        ioctl.assert_not_called()
+        self.assertFalse(os.path.exists(self.dst))
@@ -1,13 +1,21 @@
 """
 Views for file manager core app - file and folder operations.
 """
+import functools
+import hashlib
+import io
 import os
+import queue
 import shutil
+import stat
+import threading
 import zipfile
-import tempfile
+from concurrent.futures import ThreadPoolExecutor, wait
 from pathlib import Path
 from django.conf import settings
-from django.http import HttpResponse, JsonResponse
+from django.http import FileResponse, JsonResponse, StreamingHttpResponse
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import content_disposition_header, http_date, quote_etag
 from django.core.files.storage import default_storage
 from django.core.files.base import ContentFile
 from rest_framework import status, permissions
@@ -17,8 +25,87 @@ from rest_framework.views import APIView
 from rest_framework.parsers import MultiPartParser, FormParser, FileUploadParser
 import logging
 
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
 logger = logging.getLogger(__name__)
 
+# Buffer size used when copying uploaded files to disk
+UPLOAD_CHUNK_SIZE = 4 * 1024 * 1024  # 4MB
+
+# Leading bytes of a download the kernel is asked to prefetch immediately.
+# Files larger than this are also dropped from the page cache afterwards so
+# one large download does not evict other users' hot data
+DOWNLOAD_READAHEAD_SIZE = 16 * 1024 * 1024  # 16MB
+
+# Uploads with at least this many files check for name conflicts against one
+# directory listing instead of a stat per file
+UPLOAD_LISTING_THRESHOLD = 16
+
+# Threads shared by all requests for writing multi-file uploads
+UPLOAD_WRITE_WORKERS = 8
+
+# Threads shared by all requests for unlinking files in deleted folders
+DELETE_WORKERS = 16
+
+# Linux ioctl that makes dst a copy-on-write clone of src (Btrfs, XFS, ...)
+FICLONE = 0x40049409
+
+# Bytes requested per copy_file_range call when copying files
+COPY_RANGE_CHUNK_SIZE = 64 * 1024 * 1024  # 64MB
+
+# Bytes of archive handed to the response at a time while streaming a ZIP
+# download
+ZIP_STREAM_CHUNK_SIZE = 1024 * 1024  # 1MB
+
+# Archive pieces a ZIP download may build ahead of what has been sent
+ZIP_STREAM_QUEUE_SIZE = 4
+
+# Threads shared by all requests for building streamed ZIP downloads; further
+# downloads wait for a free thread
+ZIP_WRITE_WORKERS = 8
+
+# Deflate level for ZIP downloads; level 1 is several times faster than the
+# default and only slightly larger
+ZIP_COMPRESS_LEVEL = 1
+
+# Already-compressed formats are stored as-is; deflating them burns CPU
+# without shrinking them
+INCOMPRESSIBLE_EXTENSIONS = frozenset({
+    '.jpg', '.jpeg', '.png', '.gif', '.webp', '.heic',
+    '.mp3', '.mp4', '.m4a', '.mkv', '.mov', '.webm',
+    '.zip', '.gz', '.tgz', '.bz2', '.xz', '.7z', '.rar', '.zst',
+    '.pdf', '.docx', '.xlsx', '.pptx',
+})
+
+
+@functools.lru_cache(maxsize=4096)
+def _resolve_user_dir(user_id: int, dir_name: str) -> str:
+    """
+    Build a user's directory path and create it on first use.
+    
+    Cached per process so the makedirs call happens once per user instead of
+    once per request. The cache is keyed on the user id and the stored
+    directory name, so a recycled account gets a fresh cache entry.
+    
+    Args:
+        user_id: ID of the user owning the directory
+        dir_name: Name of the user's directory under MASTER_DIR
+        
+    Returns:
+        str: Full path to user's directory, with symlinks resolved
+    """
+    user_dir = os.path.join(settings.MASTER_DIR, dir_name)
+    
+    # Create directory if it doesn't exist
+    os.makedirs(user_dir, exist_ok=True)
+    
+    # Resolved so relative paths computed against it match the resolved
+    # paths returned by validate_path_security
+    return os.path.realpath(user_dir)
+
 
 def get_user_directory(user) -> str:
     """
@@ -34,42 +121,452 @@ def get_user_directory(user) -> str:
         ValueError: If user has no profile or directory
     """
     try:
-        profile = user.profile
-        user_dir = os.path.join(settings.MASTER_DIR, profile.dir_name)
-        
-        # Create directory if it doesn't exist
-        os.makedirs(user_dir, exist_ok=True)
-        
-        return user_dir
+        return _resolve_user_dir(user.id, user.profile.dir_name)
     except Exception as e:
         logger.error(f"Error getting user directory for {user.username}: {str(e)}")
         raise ValueError(f"User directory not found: {str(e)}")
 
 
-def validate_path_security(user_dir: str, target_path: str) -> str:
+def _is_within(user_dir: str, path: str) -> bool:
+    """Check whether an absolute path is the user's directory or inside it."""
+    # Compare whole path components; a plain prefix check would let
+    # "/master/user_a_10" pass for "/master/user_a_1"
+    return path == user_dir or path.startswith(user_dir + os.sep)
+
+
+def validate_path_security(user_dir: str, target_path: str, follow_symlinks: bool = True) -> str:
     """
     Validate that the target path is within the user's directory.
     
+    The returned path names the item itself: if the target is a symlink,
+    operations on the returned path act on the link, not on what it points
+    to. Only its parent directories are resolved.
+    
     Args:
-        user_dir: User's base directory
+        user_dir: User's base directory, already resolved as returned by
+            get_user_directory; an unresolved path fails closed
         target_path: Path to validate
+        follow_symlinks: Also require a symlink target to be inside the
+            user's directory. Pass False for operations that act on the link
+            itself (delete, rename, move), so links pointing elsewhere can
+            still be removed.
         
     Returns:
-        str: Resolved absolute path
+        str: Absolute path with ".." removed and parent directories resolved
         
     Raises:
         ValueError: If path is outside user's directory
     """
-    # Resolve the target path
-    resolved_path = os.path.abspath(target_path)
-    user_dir_abs = os.path.abspath(user_dir)
+    # Resolve ".." and symlinks in the parent so neither can be used to
+    # escape, but keep the last component so a link is not replaced by
+    # its target
+    parent, name = os.path.split(os.path.normpath(target_path))
+    item_path = os.path.join(os.path.realpath(parent), name)
     
-    # Check if the resolved path is within the user's directory
-    if not resolved_path.startswith(user_dir_abs):
+    if not _is_within(user_dir, item_path) or (
+        follow_symlinks and not _is_within(user_dir, os.path.realpath(item_path))
+    ):
         logger.warning(f"Security violation: {target_path} is outside user directory {user_dir}")
         raise ValueError("Access denied: Path is outside your directory")
     
-    return resolved_path
+    return item_path
+
+
+def _save_uploaded_file(file, file_path: str) -> None:
+    """
+    Write an uploaded file to its destination path.
+    
+    Uploads that Django spooled to a temporary file are moved into place,
+    which is a rename on the same filesystem. In-memory uploads are copied
+    with a large buffer.
+    
+    Args:
+        file: Django UploadedFile instance
+        file_path: Destination path
+    """
+    if hasattr(file, 'temporary_file_path'):
+        shutil.move(file.temporary_file_path(), file_path)
+        if settings.FILE_UPLOAD_PERMISSIONS is not None:
+            os.chmod(file_path, settings.FILE_UPLOAD_PERMISSIONS)
+        return
+    
+    with open(file_path, 'wb', buffering=0) as destination:
+        if hasattr(os, 'posix_fadvise'):
+            os.posix_fadvise(destination.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+        shutil.copyfileobj(file, destination, length=UPLOAD_CHUNK_SIZE)
+
+
+class _DownloadFile(io.FileIO):
+    """
+    Read-only file opened with readahead hints for streaming downloads.
+    
+    Where posix_fadvise is available, the kernel is told the file will be
+    read sequentially and its first DOWNLOAD_READAHEAD_SIZE bytes are
+    prefetched. Large files are dropped from the page cache on close.
+    """
+    
+    def __init__(self, file_path: str):
+        super().__init__(file_path, 'rb')
+        self._size = 0
+        try:
+            self._size = os.fstat(self.fileno()).st_size
+            self._advise(0, 0, 'POSIX_FADV_SEQUENTIAL')
+            self._advise(0, DOWNLOAD_READAHEAD_SIZE, 'POSIX_FADV_WILLNEED')
+        except BaseException:
+            self.close()
+            raise
+    
+    def close(self) -> None:
+        if not self.closed and self._size > DOWNLOAD_READAHEAD_SIZE:
+            self._advise(0, 0, 'POSIX_FADV_DONTNEED')
+        super().close()
+    
+    def _advise(self, offset: int, length: int, advice: str) -> None:
+        # Hints are advisory, so a platform or filesystem refusing them
+        # must not fail the download
+        if not hasattr(os, 'posix_fadvise'):
+            return
+        try:
+            os.posix_fadvise(self.fileno(), offset, length, getattr(os, advice))
+        except OSError:
+            pass
+
+
+@functools.lru_cache(maxsize=None)
+def _upload_executor() -> ThreadPoolExecutor:
+    """
+    Return the process-wide thread pool used to write uploaded files.
+    
+    Returns:
+        ThreadPoolExecutor: Pool sized by UPLOAD_WRITE_WORKERS
+    """
+    return ThreadPoolExecutor(
+        max_workers=UPLOAD_WRITE_WORKERS,
+        thread_name_prefix='upload-write'
+    )
+
+
+def _save_uploaded_files(pending: list) -> list:
+    """
+    Write several uploads to disk, concurrently when there is more than one.
+    
+    Waits for every write to finish, so none is still running once the
+    request closes its uploaded files.
+    
+    Args:
+        pending: (UploadedFile, destination path) pairs
+        
+    Returns:
+        list: For each pair, the exception raised while saving it, or None
+    """
+    if len(pending) <= 1:
+        errors = []
+        for file, file_path in pending:
+            try:
+                _save_uploaded_file(file, file_path)
+                errors.append(None)
+            except Exception as e:
+                errors.append(e)
+        return errors
+    
+    futures = [
+        _upload_executor().submit(_save_uploaded_file, file, file_path)
+        for file, file_path in pending
+    ]
+    wait(futures)
+    return [future.exception() for future in futures]
+
+
+@functools.lru_cache(maxsize=None)
+def _delete_executor() -> ThreadPoolExecutor:
+    """
+    Return the process-wide thread pool used to delete folder contents.
+    
+    Returns:
+        ThreadPoolExecutor: Pool sized by DELETE_WORKERS
+    """
+    return ThreadPoolExecutor(
+        max_workers=DELETE_WORKERS,
+        thread_name_prefix='delete'
+    )
+
+
+def _unlink_all(root: str, names: list) -> None:
+    """
+    Unlink a batch of non-directory entries in one directory.
+    
+    Args:
+        root: Directory containing the entries
+        names: Entry names to unlink
+    """
+    for name in names:
+        os.unlink(os.path.join(root, name))
+
+
+def _parallel_rmtree(path: str) -> None:
+    """
+    Delete a directory tree, unlinking files of each folder in parallel.
+    
+    Files are removed one task per folder on a shared pool, then the
+    emptied folders are removed deepest first. If anything fails, the
+    removal is finished with shutil.rmtree so errors surface the same way.
+    
+    Args:
+        path: Directory to delete
+    """
+    directories = []
+    futures = []
+    for root, dirnames, filenames in os.walk(path):
+        directories.append(root)
+        # Symlinks to directories are listed with dirnames but not walked
+        links = [name for name in dirnames if os.path.islink(os.path.join(root, name))]
+        if filenames or links:
+            futures.append(_delete_executor().submit(_unlink_all, root, filenames + links))
+    wait(futures)
+    
+    try:
+        for future in futures:
+            future.result()
+        # os.walk is top-down, so reversed order removes children first
+        for directory in reversed(directories):
+            os.rmdir(directory)
+    except OSError:
+        shutil.rmtree(path)
+
+
+def _clone_or_copy_range(src: str, dst: str) -> bool:
+    """
+    Copy file contents inside the kernel without a userspace buffer.
+    
+    Tries a FICLONE reflink first, which is instant on copy-on-write
+    filesystems, then copy_file_range, which lets NFS and similar do a
+    server-side copy.
+    
+    Args:
+        src: Source file path
+        dst: Destination file path, created or truncated
+        
+    Returns:
+        bool: True if the contents were copied, False if src is not a
+            regular file or neither call is supported here and the caller
+            should fall back
+    """
+    # Opening a FIFO or device could block or read forever
+    if not stat.S_ISREG(os.stat(src).st_mode):
+        return False
+    
+    with open(src, 'rb') as fsrc, open(dst, 'wb') as fdst:
+        try:
+            fcntl.ioctl(fdst.fileno(), FICLONE, fsrc.fileno())
+            return True
+        except OSError:
+            pass
+        
+        if not hasattr(os, 'copy_file_range'):
+            return False
+        try:
+            while os.copy_file_range(fsrc.fileno(), fdst.fileno(), COPY_RANGE_CHUNK_SIZE):
+                pass
+            return True
+        except OSError:
+            return False
+
+
+def _copy_file(src: str, dst: str, *, follow_symlinks: bool = True) -> str:
+    """
+    Copy a file with its metadata, preferring kernel-side copies.
+    
+    Drop-in replacement for shutil.copy2, usable as the copy_function of
+    shutil.copytree and shutil.move.
+    
+    Args:
+        src: Source file path
+        dst: Destination file path
+        follow_symlinks: Copy the symlink target rather than the link
+        
+    Returns:
+        str: Destination path
+    """
+    if (fcntl is not None and not os.path.isdir(dst)
+            and (follow_symlinks or not os.path.islink(src))):
+        if _clone_or_copy_range(src, dst):
+            shutil.copystat(src, dst, follow_symlinks=follow_symlinks)
+            return dst
+    return shutil.copy2(src, dst, follow_symlinks=follow_symlinks)
+
+
+def _zip_compress_type(file_name: str) -> int:
+    """
+    Pick the ZIP compression method for a file.
+    
+    Args:
+        file_name: Name of the file being archived
+        
+    Returns:
+        int: zipfile.ZIP_STORED for already-compressed formats,
+            zipfile.ZIP_DEFLATED otherwise
+    """
+    extension = os.path.splitext(file_name)[1].lower()
+    if extension in INCOMPRESSIBLE_EXTENSIONS:
+        return zipfile.ZIP_STORED
+    return zipfile.ZIP_DEFLATED
+
+
+class _ZipStreamSink(io.RawIOBase):
+    """
+    Write-only, unseekable file that hands a ZIP archive over while it is
+    being written.
+    
+    ZipFile falls back to data descriptors for unseekable outputs, so the
+    archive can be sent while it is being built. Writes are collected into
+    ZIP_STREAM_CHUNK_SIZE pieces and queued for get(); the queue is bounded,
+    so the writer waits while the response falls behind.
+    """
+    
+    def __init__(self):
+        super().__init__()
+        self._buffer = bytearray()
+        self._pieces = queue.Queue(maxsize=ZIP_STREAM_QUEUE_SIZE)
+        self._cancelled = threading.Event()
+    
+    def writable(self) -> bool:
+        return True
+    
+    def write(self, data) -> int:
+        self._buffer += data
+        if len(self._buffer) >= ZIP_STREAM_CHUNK_SIZE:
+            self._put(bytes(self._buffer))
+            self._buffer.clear()
+        return len(data)
+    
+    def finish(self):
+        """Queue what is left of the archive, then the end marker."""
+        if self._buffer:
+            self._put(bytes(self._buffer))
+            self._buffer.clear()
+        self._put(None)
+    
+    def cancel(self):
+        """Make the writer stop at its next write, e.g. when the client left."""
+        self._cancelled.set()
+    
+    def get(self):
+        """
+        Return the next piece of the archive.
+        
+        Returns:
+            bytes: Next piece, or None once the archive is complete
+        """
+        return self._pieces.get()
+    
+    def _put(self, piece):
+        while True:
+            if self._cancelled.is_set():
+                raise OSError('ZIP download was cancelled')
+            try:
+                self._pieces.put(piece, timeout=1)
+                return
+            except queue.Full:
+                pass
+
+
+@functools.lru_cache(maxsize=None)
+def _zip_executor() -> ThreadPoolExecutor:
+    """
+    Return the process-wide thread pool used to build streamed ZIP downloads.
+    
+    Returns:
+        ThreadPoolExecutor: Pool sized by ZIP_WRITE_WORKERS
+    """
+    return ThreadPoolExecutor(
+        max_workers=ZIP_WRITE_WORKERS,
+        thread_name_prefix='zip-write'
+    )
+
+
+def _write_zip(folder_path: str, sink: _ZipStreamSink):
+    """
+    Write a ZIP archive of a folder into a sink, then mark it complete.
+    
+    Args:
+        folder_path: Folder to archive
+        sink: Sink the archive is written into
+    """
+    try:
+        with zipfile.ZipFile(sink, 'w', zipfile.ZIP_DEFLATED, allowZip64=True,
+                             compresslevel=ZIP_COMPRESS_LEVEL) as zipf:
+            for root, dirs, files in os.walk(folder_path):
+                for file in files:
+                    file_path = os.path.join(root, file)
+                    arc_name = os.path.relpath(file_path, folder_path)
+                    zipf.write(file_path, arc_name, compress_type=_zip_compress_type(file))
+    finally:
+        sink.finish()
+
+
+def _stream_zip(folder_path: str):
+    """
+    Generate a ZIP archive of a folder piece by piece.
+    
+    The archive is built on a _zip_executor() thread and its pieces are
+    yielded as they are written, so compression overlaps sending and no
+    copy of the archive is kept in memory or on disk.
+    
+    Args:
+        folder_path: Folder to archive
+        
+    Yields:
+        bytes: Consecutive pieces of the ZIP archive
+    """
+    sink = _ZipStreamSink()
+    future = _zip_executor().submit(_write_zip, folder_path, sink)
+    try:
+        while (piece := sink.get()) is not None:
+            yield piece
+        # Re-raise an error that cut the archive short
+        future.result()
+    finally:
+        sink.cancel()
+
+
+def _directory_entry_row(entry: os.DirEntry) -> tuple:
+    """
+    Build the sortable listing row for a single directory entry.
+    
+    Uses one lstat() per entry; the entry type comes from the directory
+    read itself on most platforms. Rows compare as plain tuples, so a
+    listing sorts without a Python key function: directories first, then
+    by case-insensitive name.
+    
+    Args:
+        entry: Entry yielded by os.scandir
+        
+    Returns:
+        tuple: (is_file, lowercased name, name, size or None, modification time)
+    """
+    st = entry.stat(follow_symlinks=False)
+    is_directory = entry.is_dir(follow_symlinks=False)
+    return (
+        not is_directory,
+        entry.name.lower(),
+        entry.name,
+        st.st_size if not is_directory else None,
+        st.st_mtime,
+    )
+
+
+@functools.lru_cache(maxsize=None)
+def _stat_executor() -> ThreadPoolExecutor:
+    """
+    Return the process-wide thread pool used to stat directory entries.
+    
+    Returns:
+        ThreadPoolExecutor: Pool sized by LIST_DIRECTORY_STAT_WORKERS
+    """
+    return ThreadPoolExecutor(
+        max_workers=settings.LIST_DIRECTORY_STAT_WORKERS,
+        thread_name_prefix='list-stat'
+    )
 
 
 @api_view(['GET'])
@@ -103,26 +600,44 @@ def list_directory(request):
             }, status=status.HTTP_400_BAD_REQUEST)
         
         # List directory contents
-        items = []
-        for item in os.listdir(full_path):
-            item_path = os.path.join(full_path, item)
-            item_info = {
-                'name': item,
-                'is_directory': os.path.isdir(item_path),
-                'size': os.path.getsize(item_path) if os.path.isfile(item_path) else None,
-                'modified': os.path.getmtime(item_path),
-            }
-            items.append(item_info)
+        with os.scandir(full_path) as entries:
+            if settings.LIST_DIRECTORY_STAT_WORKERS > 0:
+                # Overlap per-entry stat latency on network filesystems
+                rows = list(_stat_executor().map(_directory_entry_row, list(entries)))
+            else:
+                rows = [_directory_entry_row(entry) for entry in entries]
         
         # Sort: directories first, then files
-        items.sort(key=lambda x: (not x['is_directory'], x['name'].lower()))
+        rows.sort()
+        
+        # A folder's own mtime does not change when a file in it is
+        # rewritten, so the ETag covers the listed rows, not the folder stat
+        etag = 'W/' + quote_etag(
+            hashlib.blake2b(repr((target_dir, rows)).encode(), digest_size=16).hexdigest()
+        )
+        not_modified = get_conditional_response(request, etag=etag)
+        if not_modified is not None:
+            return not_modified
+        
+        items = [
+            {
+                'name': name,
+                'is_directory': not is_file,
+                'size': size,
+                'modified': modified,
+            }
+            for is_file, _, name, size, modified in rows
+        ]
         
         logger.info(f"Directory listed for user {user.username}: {full_path}")
-        return Response({
+        response = Response({
             'path': target_dir,
             'items': items,
             'total_items': len(items)
         })
+        response['ETag'] = etag
+        patch_cache_control(response, private=True, no_cache=True)
+        return response
         
     except ValueError as e:
         return Response({
@@ -168,40 +683,58 @@ def upload_file(request):
                 'error': 'No files provided'
             }, status=status.HTTP_400_BAD_REQUEST)
         
+        # Check every name before writing anything, so a conflict leaves
+        # the directory untouched. taken_names collects names from this
+        # upload and, for larger batches, everything already in the folder
+        pending = []
+        if len(files) >= UPLOAD_LISTING_THRESHOLD:
+            with os.scandir(upload_path) as entries:
+                taken_names = {entry.name for entry in entries}
+            check_disk = False
+        else:
+            taken_names = set()
+            check_disk = True
+        
         for file in files:
-            try:
-                # Validate file name
-                if not file.name or file.name.strip() == '':
-                    continue
-                
-                # Create file path
-                file_path = os.path.join(upload_path, file.name)
-                
-                # Check if file already exists
-                if os.path.exists(file_path):
-                    return Response({
-                        'error': f'File {file.name} already exists'
-                    }, status=status.HTTP_409_CONFLICT)
-                
-                # Save file
-                with open(file_path, 'wb+') as destination:
-                    for chunk in file.chunks():
-                        destination.write(chunk)
-                
-                uploaded_files.append({
-                    'name': file.name,
-                    'size': file.size,
-                    'path': os.path.relpath(file_path, user_dir)
-                })
-                
-                logger.info(f"File uploaded by {user.username}: {file_path}")
-                
-            except Exception as e:
-                logger.error(f"Error uploading file {file.name} for {user.username}: {str(e)}")
+            # Validate file name
+            if not file.name or file.name.strip() == '':
+                continue
+            
+            # Create file path
+            file_path = os.path.join(upload_path, file.name)
+            
+            # Check if file already exists or is repeated in this upload
+            if file.name in taken_names or (check_disk and os.path.exists(file_path)):
+                return Response({
+                    'error': f'File {file.name} already exists'
+                }, status=status.HTTP_409_CONFLICT)
+            
+            taken_names.add(file.name)
+            pending.append((file, file_path))
+        
+        # Save files
+        errors = _save_uploaded_files(pending)
+        
+        # All files share one folder, so compute its relative path once
+        upload_rel_dir = os.path.relpath(upload_path, user_dir)
+        if upload_rel_dir == os.curdir:
+            upload_rel_dir = ''
+        
+        for (file, file_path), error in zip(pending, errors):
+            if error is not None:
+                logger.error(f"Error uploading file {file.name} for {user.username}: {str(error)}")
                 return Response({
                     'error': f'Failed to upload {file.name}',
-                    'details': str(e)
+                    'details': str(error)
                 }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+            
+            uploaded_files.append({
+                'name': file.name,
+                'size': file.size,
+                'path': os.path.join(upload_rel_dir, file.name)
+            })
+            
+            logger.info(f"File uploaded by {user.username}: {file_path}")
         
         return Response({
             'message': f'Successfully uploaded {len(uploaded_files)} files',
@@ -252,10 +785,24 @@ def download_file(request):
                 'error': 'Path is not a file'
             }, status=status.HTTP_400_BAD_REQUEST)
         
-        # Read and return file
-        with open(full_path, 'rb') as file:
-            response = HttpResponse(file.read(), content_type='application/octet-stream')
-            response['Content-Disposition'] = f'attachment; filename="{os.path.basename(full_path)}"'
+        # Answer conditional requests for an unchanged file without opening it
+        st = os.stat(full_path)
+        etag = quote_etag(f"{st.st_ino:x}-{st.st_mtime_ns:x}-{st.st_size:x}")
+        last_modified = int(st.st_mtime)
+        not_modified = get_conditional_response(request, etag=etag, last_modified=last_modified)
+        if not_modified is not None:
+            return not_modified
+        
+        # Stream the file; FileResponse closes it when the response is done
+        response = FileResponse(
+            _DownloadFile(full_path),
+            as_attachment=True,
+            filename=os.path.basename(full_path),
+            content_type='application/octet-stream'
+        )
+        response['ETag'] = etag
+        response['Last-Modified'] = http_date(last_modified)
+        patch_cache_control(response, private=True, no_cache=True)
         
         logger.info(f"File downloaded by {user.username}: {full_path}")
         return response
@@ -292,16 +839,21 @@ def delete_item(request):
             }, status=status.HTTP_400_BAD_REQUEST)
         
         full_path = os.path.join(user_dir, item_path)
-        full_path = validate_path_security(user_dir, full_path)
+        full_path = validate_path_security(user_dir, full_path, follow_symlinks=False)
         
-        if not os.path.exists(full_path):
+        if full_path == user_dir:
+            return Response({
+                'error': 'Cannot delete your root directory'
+            }, status=status.HTTP_400_BAD_REQUEST)
+        
+        if not os.path.lexists(full_path):
             return Response({
                 'error': 'Item not found'
             }, status=status.HTTP_404_NOT_FOUND)
         
-        # Delete item
-        if os.path.isdir(full_path):
-            shutil.rmtree(full_path)
+        # Delete item; a symlink is unlinked even when it points to a folder
+        if os.path.isdir(full_path) and not os.path.islink(full_path):
+            _parallel_rmtree(full_path)
             logger.info(f"Directory deleted by {user.username}: {full_path}")
         else:
             os.remove(full_path)
@@ -343,9 +895,9 @@ def rename_item(request):
             }, status=status.HTTP_400_BAD_REQUEST)
         
         old_full_path = os.path.join(user_dir, old_path)
-        old_full_path = validate_path_security(user_dir, old_full_path)
+        old_full_path = validate_path_security(user_dir, old_full_path, follow_symlinks=False)
         
-        if not os.path.exists(old_full_path):
+        if not os.path.lexists(old_full_path):
             return Response({
                 'error': 'Item not found'
             }, status=status.HTTP_404_NOT_FOUND)
@@ -354,7 +906,7 @@ def rename_item(request):
         new_path = os.path.join(os.path.dirname(old_full_path), new_name)
         new_path = validate_path_security(user_dir, new_path)
         
-        if os.path.exists(new_path):
+        if os.path.lexists(new_path):
             return Response({
                 'error': 'Item with new name already exists'
             }, status=status.HTTP_409_CONFLICT)
@@ -400,7 +952,7 @@ def move_item(request):
             }, status=status.HTTP_400_BAD_REQUEST)
         
         source_full_path = os.path.join(user_dir, source_path)
-        source_full_path = validate_path_security(user_dir, source_full_path)
+        source_full_path = validate_path_security(user_dir, source_full_path, follow_symlinks=False)
         
         # Handle destination path (empty string means root directory)
         if dest_path:
@@ -409,7 +961,7 @@ def move_item(request):
         else:
             dest_full_path = user_dir
         
-        if not os.path.exists(source_full_path):
+        if not os.path.lexists(source_full_path):
             return Response({
                 'error': 'Source item not found'
             }, status=status.HTTP_404_NOT_FOUND)
@@ -422,13 +974,13 @@ def move_item(request):
         # Create destination path
         final_dest_path = os.path.join(dest_full_path, os.path.basename(source_full_path))
         
-        if os.path.exists(final_dest_path):
+        if os.path.lexists(final_dest_path):
             return Response({
                 'error': 'Item with same name already exists in destination'
             }, status=status.HTTP_409_CONFLICT)
         
         # Move item
-        shutil.move(source_full_path, final_dest_path)
+        shutil.move(source_full_path, final_dest_path, copy_function=_copy_file)
         
         logger.info(f"Item moved by {user.username}: {source_full_path} -> {final_dest_path}")
         return Response({
@@ -497,9 +1049,9 @@ def copy_item(request):
         
         # Copy item
         if os.path.isdir(source_full_path):
-            shutil.copytree(source_full_path, final_dest_path)
+            shutil.copytree(source_full_path, final_dest_path, copy_function=_copy_file)
         else:
-            shutil.copy2(source_full_path, final_dest_path)
+            _copy_file(source_full_path, final_dest_path)
         
         logger.info(f"Item copied by {user.username}: {source_full_path} -> {final_dest_path}")
         return Response({
@@ -604,22 +1156,11 @@ def download_zip(request):
                 'error': 'Path is not a folder'
             }, status=status.HTTP_400_BAD_REQUEST)
         
-        # Create temporary ZIP file
-        with tempfile.NamedTemporaryFile(suffix='.zip', delete=False) as temp_zip:
-            with zipfile.ZipFile(temp_zip.name, 'w', zipfile.ZIP_DEFLATED) as zipf:
-                for root, dirs, files in os.walk(full_path):
-                    for file in files:
-                        file_path = os.path.join(root, file)
-                        arc_name = os.path.relpath(file_path, full_path)
-                        zipf.write(file_path, arc_name)
-        
-        # Read and return ZIP file
-        with open(temp_zip.name, 'rb') as zip_file:
-            response = HttpResponse(zip_file.read(), content_type='application/zip')
-            response['Content-Disposition'] = f'attachment; filename="{os.path.basename(full_path)}.zip"'
-        
-        # Clean up temporary file
-        os.unlink(temp_zip.name)
+        # Build and send the ZIP at the same time
+        response = StreamingHttpResponse(_stream_zip(full_path), content_type='application/zip')
+        response['Content-Disposition'] = content_disposition_header(
+            True, f"{os.path.basename(full_path)}.zip"
+        )
         
         logger.info(f"Folder downloaded as ZIP by {user.username}: {full_path}")
         return response
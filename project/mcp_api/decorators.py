@@ -0,0 +1,71 @@
+"""
+Decorators for IP-based authentication of MCP API endpoints.
+Only requests coming from an allowed IP address reach the wrapped view.
+"""
+
+import logging
+from functools import wraps
+from typing import Callable
+from django.conf import settings
+from django.http import JsonResponse
+
+logger = logging.getLogger(settings.MCP_LOGGER)
+
+# Built once so each request does a hash lookup instead of a list scan
+_ALLOWED_IPS = frozenset(settings.MCP_ALLOWED_IPS)
+
+
+def get_client_ip(request) -> str:
+    """
+    Get the client IP address from the request.
+    
+    Args:
+        request: The HTTP request object
+        
+    Returns:
+        str: The client IP address
+    """
+    # Try to get IP from various headers (for proxy scenarios)
+    x_forwarded_for = request.META.get('HTTP_X_FORWARDED_FOR')
+    if x_forwarded_for:
+        # Get the first IP in the list
+        return x_forwarded_for.split(',', 1)[0].strip()
+    
+    # Fallback to REMOTE_ADDR
+    return request.META.get('REMOTE_ADDR', 'unknown')
+
+
+def mcp_ip_required(view_func: Callable) -> Callable:
+    """
+    Restrict a view to clients whose IP is in MCP_ALLOWED_IPS.
+    
+    Applied to the MCP views only, so the rest of the project does not pay
+    for the check on every request.
+    
+    Args:
+        view_func: The view to protect
+        
+    Returns:
+        Callable: The wrapped view, answering 403 for unauthorized IPs
+    """
+    @wraps(view_func)
+    def wrapper(request, *args, **kwargs):
+        # Get client IP
+        client_ip = get_client_ip(request)
+        
+        # Log the request
+        logger.info("MCP API request from IP: %s to endpoint: %s", client_ip, request.path)
+        
+        # Check if IP is allowed
+        if client_ip not in _ALLOWED_IPS:
+            logger.warning("MCP API access denied for IP: %s", client_ip)
+            return JsonResponse({
+                'error': 'Access denied',
+                'message': 'Your IP address is not authorized to access MCP API endpoints',
+                'ip': client_ip
+            }, status=403)
+        
+        logger.debug("MCP API: IP %s authenticated successfully", client_ip)
+        return view_func(request, *args, **kwargs)
+    
+    return wrapper
@@ -1,3 +1,239 @@
+import json
+import os
+import shutil
+import tempfile
+from unittest import mock
+
 from django.test import TestCase
 
-# Create your tests here.
+from . import utils
+from .views import MAX_PAYLOAD_SIZE, MAX_PYTHON_CODE_LENGTH, _encode_cursor
+
+
+class MCPTestCase(TestCase):
+    """Base case running the MCP views over a temporary master_dir."""
+
+    user_dir = 'user_test_1'
+
+    def setUp(self):
+        self.master_dir = os.path.realpath(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, self.master_dir)
+        patcher = mock.patch.object(utils, '_MASTER_DIR', self.master_dir)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        utils._cached_user_dir.cache_clear()
+        self.addCleanup(utils._cached_user_dir.cache_clear)
+
+        self.user_path = os.path.join(self.master_dir, self.user_dir)
+        os.makedirs(self.user_path)
+
+    def patch_runners(self):
+        """Replace both script runners with one mock and return it."""
+        runner = mock.Mock(return_value={'success': True, 'output': '', 'error_output': ''})
+        for name in ('_run_python_script', '_run_python_script_docker'):
+            patcher = mock.patch.object(utils, name, runner)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        return runner
+
+    def post(self, url, payload, query=''):
+        return self.client.post(
+            f'{url}?{query}' if query else url,
+            data=json.dumps(payload),
+            content_type='application/json'
+        )
+
+
+class ListDirRecursivelyPaginationTests(MCPTestCase):
+    """Cursor pagination of the list_dir_recursively endpoint."""
+
+    url = '/mcp_api/list_dir_recursively/'
+
+    # Every path of the test tree, in listing order. "a-b.txt" sorts between
+    # directory "a" and its entries, so the walk has to interleave them
+    paths = [
+        'a',
+        'a-b.txt',
+        'a/x.txt',
+        'a/y',
+        'a/y/z.txt',
+        'b.txt',
+        'c',
+        'c/d.txt',
+    ]
+
+    def setUp(self):
+        super().setUp()
+        for path in self.paths:
+            full_path = os.path.join(self.user_path, path)
+            if path.endswith('.txt'):
+                os.makedirs(os.path.dirname(full_path), exist_ok=True)
+                with open(full_path, 'w') as f:
+                    f.write(path)
+            else:
+                os.makedirs(full_path, exist_ok=True)
+
+    def get_page(self, page_size=None, cursor=None):
+        params = {}
+        if page_size is not None:
+            params['page_size'] = page_size
+        if cursor is not None:
+            params['cursor'] = cursor
+        query = '&'.join(f'{key}={value}' for key, value in params.items())
+        return self.post(self.url, {'user_dir': self.user_dir}, query)
+
+    def test_first_page(self):
+        response = self.get_page(page_size=3)
+
+        self.assertEqual(response.status_code, 200)
+        page = response.json()
+        self.assertEqual([item['path'] for item in page['items']], self.paths[:3])
+        self.assertEqual(page['next_cursor'], _encode_cursor(self.paths[2]))
+
+    def test_next_pages_cover_the_listing(self):
+        listed = []
+        cursor = None
+        for _ in range(len(self.paths)):
+            page = self.get_page(page_size=3, cursor=cursor).json()
+            listed.extend(item['path'] for item in page['items'])
+            cursor = page['next_cursor']
+            if cursor is None:
+                break
+
+        self.assertEqual(listed, self.paths)
+
+    def test_last_page_has_no_cursor(self):
+        # A page that ends exactly on the last item must not promise another
+        page = self.get_page(page_size=4, cursor=_encode_cursor(self.paths[3])).json()
+
+        self.assertEqual([item['path'] for item in page['items']], self.paths[4:])
+        self.assertIsNone(page['next_cursor'])
+
+    def test_resume_after_deleted_path(self):
+        # The cursor names the page's last path; removing it between pages
+        # must not lose or repeat the entries after it
+        page = self.get_page(page_size=3).json()
+        os.remove(os.path.join(self.user_path, page['items'][-1]['path']))
+
+        page = self.get_page(page_size=10, cursor=page['next_cursor']).json()
+
+        self.assertEqual([item['path'] for item in page['items']], self.paths[3:])
+        self.assertIsNone(page['next_cursor'])
+
+    def test_invalid_cursor(self):
+        response = self.get_page(page_size=3, cursor='not*base64')
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json()['error'], 'Invalid cursor')
+
+    def test_invalid_page_size(self):
+        response = self.get_page(page_size=0)
+
+        self.assertEqual(response.status_code, 400)
+
+    def test_unpaginated_listing_is_streamed_whole(self):
+        response = self.get_page()
+
+        self.assertEqual(response.status_code, 200)
+        body = json.loads(b''.join(response.streaming_content))
+        self.assertEqual([item['path'] for item in body['items']], self.paths)
+        self.assertNotIn('next_cursor', body)
+
+
+class PathContainmentTests(MCPTestCase):
+    """User and target paths may not leave the user's directory."""
+
+    def setUp(self):
+        super().setUp()
+        os.makedirs(os.path.join(self.user_path, 'docs'))
+        with open(os.path.join(self.user_path, 'docs', 'readme.txt'), 'w') as f:
+            f.write('readme')
+
+        other_path = os.path.join(self.master_dir, 'user_other_2')
+        os.makedirs(other_path)
+        with open(os.path.join(other_path, 'secret.txt'), 'w') as f:
+            f.write('secret')
+
+        self.outside = os.path.realpath(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, self.outside)
+        os.symlink(self.outside, os.path.join(self.user_path, 'escape'))
+        os.symlink(self.outside, os.path.join(self.master_dir, 'user_link_3'))
+
+        self.runner = self.patch_runners()
+
+    def list_dir(self, user_dir, dir_name=''):
+        return self.post('/mcp_api/list_dir/', {'user_dir': user_dir, 'dir_name': dir_name}).json()
+
+    def test_subpath_resolves(self):
+        result = self.list_dir(self.user_dir, 'docs')
+
+        self.assertTrue(result['success'])
+        self.assertEqual([item['path'] for item in result['items']], [os.path.join('docs', 'readme.txt')])
+
+    def test_rejected_target_dirs(self):
+        for dir_name in ('../user_other_2', 'docs/../../user_other_2', self.outside, '/etc', 'escape'):
+            with self.subTest(dir_name=dir_name):
+                result = self.list_dir(self.user_dir, dir_name)
+                self.assertFalse(result['success'])
+                self.assertEqual(result['items'], [])
+
+                response = self.post(
+                    '/mcp_api/list_dir_recursively/', {'user_dir': self.user_dir, 'dir_name': dir_name}
+                )
+                self.assertFalse(response.json()['success'])
+
+    def test_rejected_user_dirs(self):
+        for user_dir in ('..', '../' + os.path.basename(self.outside), self.outside, 'user_link_3'):
+            with self.subTest(user_dir=user_dir):
+                self.assertFalse(self.list_dir(user_dir)['success'])
+
+                result = self.post(
+                    '/mcp_api/run_python_code/', {'user_dir': user_dir, 'python_code': 'print(1)'}
+                ).json()
+                self.assertFalse(result['success'])
+        self.runner.assert_not_called()
+
+    def test_code_runs_in_user_dir(self):
+        result = self.post(
+            '/mcp_api/run_python_code/', {'user_dir': self.user_dir, 'python_code': 'print(1)'}
+        ).json()
+
+        self.assertTrue(result['success'])
+        self.runner.assert_called_once_with('print(1)', self.user_path)
+
+
+class PayloadSizeTests(MCPTestCase):
+    """Oversized bodies and python_code are refused with 413 before running."""
+
+    def setUp(self):
+        super().setUp()
+        self.runner = self.patch_runners()
+
+    def run_code(self, python_code, **extra):
+        return self.post('/mcp_api/run_python_code/', {'user_dir': self.user_dir, 'python_code': python_code, **extra})
+
+    def test_body_over_limit(self):
+        padding = 'x' * MAX_PAYLOAD_SIZE
+
+        for url in ('/mcp_api/run_python_code/', '/mcp_api/list_dir/', '/mcp_api/list_dir_recursively/'):
+            with self.subTest(url=url):
+                response = self.post(url, {'user_dir': self.user_dir, 'python_code': 'print(1)', 'padding': padding})
+                self.assertEqual(response.status_code, 413)
+                self.assertFalse(response.json()['success'])
+        self.runner.assert_not_called()
+
+    def test_python_code_over_limit(self):
+        response = self.run_code('#' * (MAX_PYTHON_CODE_LENGTH + 1))
+
+        self.assertEqual(response.status_code, 413)
+        self.assertEqual(response.json()['error'], f'python_code exceeds {MAX_PYTHON_CODE_LENGTH} characters')
+        self.runner.assert_not_called()
+
+    def test_within_limits_is_accepted(self):
+        python_code = '#' * MAX_PYTHON_CODE_LENGTH
+
+        response = self.run_code(python_code, padding='x' * (MAX_PAYLOAD_SIZE // 2))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.json()['success'])
+        self.runner.assert_called_once_with(python_code, self.user_path)
@@ -3,22 +3,130 @@ Utility functions for MCP API operations.
 This module contains functions for Python code execution and directory operations.
 """
 
+import functools
 import os
 import sys
 import subprocess
-import tempfile
 import logging
-from pathlib import Path
-from typing import Dict, List, Tuple, Any, Optional
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from operator import itemgetter
+from typing import Dict, Iterator, List, Tuple, Any, Optional
 from django.conf import settings
 import io
 import contextlib
 
 logger = logging.getLogger(settings.MCP_LOGGER)
 
+# Settings are fixed for the life of the process; read them once. The
+# master directory is resolved so that prefix checks compare real paths
+_MASTER_DIR = os.path.realpath(settings.MASTER_DIR)
+_WALK_WORKERS = settings.MCP_WALK_WORKERS
+
+# Directories a single recursive walk reads ahead of its position
+_WALK_READAHEAD = 4 * _WALK_WORKERS
+
 # Switch to control sandboxing method
 USE_DOCKER_SANDBOX = True  # Set to True to use Docker-based sandboxing
 
+# Environment for locally run code: only what the interpreter needs to start,
+# built once. Server settings and secrets from os.environ are not passed on
+_CHILD_ENV_KEYS = ('PATH', 'HOME', 'LANG', 'LC_ALL', 'LC_CTYPE', 'TMPDIR', 'TEMP', 'TMP', 'SYSTEMROOT')
+_CHILD_ENV = {key: os.environ[key] for key in _CHILD_ENV_KEYS if key in os.environ}
+
+# Upper bound on interpreters (or containers) running at once; further
+# requests wait for a slot instead of all forking together
+MAX_CONCURRENT_EXECUTIONS = min(os.cpu_count() or 1, 8)
+_EXEC_SEM = threading.BoundedSemaphore(MAX_CONCURRENT_EXECUTIONS)
+
+
+@functools.lru_cache(maxsize=4096)
+def _cached_user_dir(user_dir: str) -> str:
+    """
+    Resolve a user directory name to its real path below master_dir.
+    
+    Only successful resolutions are cached: lru_cache does not store calls
+    that raise, so a directory created later is still picked up.
+    
+    Args:
+        user_dir (str): The user's directory name in master_dir
+        
+    Returns:
+        str: Real path of the user directory
+        
+    Raises:
+        FileNotFoundError: If the path escapes master_dir or is not a
+            directory
+    """
+    path = os.path.realpath(os.path.join(_MASTER_DIR, user_dir))
+    if not path.startswith(_MASTER_DIR + os.sep) or not os.path.isdir(path):
+        raise FileNotFoundError(path)
+    return path
+
+
+def _resolve_user_dir(user_dir: str) -> Optional[str]:
+    """
+    Resolve and validate a user directory name.
+    
+    Names that resolve outside master_dir (``..``, absolute paths, symlinks
+    pointing elsewhere) are treated as nonexistent.
+    
+    Args:
+        user_dir (str): The user's directory name in master_dir
+        
+    Returns:
+        Optional[str]: Real path of the user directory, or None if it does
+            not exist or is outside master_dir
+    """
+    try:
+        return _cached_user_dir(user_dir)
+    except (FileNotFoundError, ValueError):
+        # ValueError: embedded null byte
+        return None
+
+
+def _resolve_target_dir(user_path: str, target_dir: str) -> Optional[str]:
+    """
+    Resolve a path inside a user directory.
+    
+    Args:
+        user_path (str): Real path of the user directory
+        target_dir (str): Path relative to the user directory (empty for
+            the user directory itself)
+        
+    Returns:
+        Optional[str]: Real path of the target, or None if it resolves
+            outside the user directory or is not a valid path
+    """
+    if not target_dir:
+        return user_path
+    try:
+        path = os.path.realpath(os.path.join(user_path, target_dir))
+    except ValueError:
+        # Embedded null byte
+        return None
+    if path != user_path and not path.startswith(user_path + os.sep):
+        logger.warning("Target path escapes user directory %s: %s", user_path, target_dir)
+        return None
+    return path
+
+
+def _relative_to(path: str, base: str) -> str:
+    """
+    Return a resolved path relative to a directory it lies in.
+    
+    Both paths come from the resolvers above, so ``path`` is ``base`` or
+    starts with ``base + os.sep`` and a slice is enough.
+    
+    Args:
+        path (str): Real path at or below base
+        base (str): Real path of the containing directory
+        
+    Returns:
+        str: Relative path, empty for base itself
+    """
+    return path[len(base) + 1:]
+
 
 def execute_python_code(user_dir: str, python_code: str) -> Dict[str, Any]:
     """
@@ -34,15 +142,14 @@ def execute_python_code(user_dir: str, python_code: str) -> Dict[str, Any]:
     # Debug logging
     # return python_code
     # print(python_code)
-    if settings.DEBUG:
-        logger.debug(f"Executing Python code for user_dir: {user_dir}")
-        logger.debug(f"Code length: {len(python_code)} characters")
-        logger.debug(f"USE_DOCKER_SANDBOX: {USE_DOCKER_SANDBOX}")
+    logger.debug("Executing Python code for user_dir: %s", user_dir)
+    logger.debug("Code length: %s characters", len(python_code))
+    logger.debug("USE_DOCKER_SANDBOX: %s", USE_DOCKER_SANDBOX)
 
     # Validate user directory
-    user_path = Path(settings.MASTER_DIR) / user_dir
-    if not user_path.exists():
-        logger.error(f"User directory does not exist: {user_path}")
+    user_path = _resolve_user_dir(user_dir)
+    if user_path is None:
+        logger.error("User directory does not exist: %s", user_dir)
         return {
             'success': False,
             'error': f'User directory "{user_dir}" does not exist',
@@ -50,34 +157,17 @@ def execute_python_code(user_dir: str, python_code: str) -> Dict[str, Any]:
             'error_output': ''
         }
 
-    # Create a temporary file for the code
+    # The code is piped to the interpreter's stdin, so nothing is written
+    # to the user's directory
     try:
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.py', delete=False, dir=user_path) as temp_file:
-            temp_file.write(python_code)
-            temp_file_path = temp_file.name
-
-        # Debug logging
-        if settings.DEBUG:
-            logger.debug(f"Created temporary file: {temp_file_path}")
-
         # Choose execution method
-        if USE_DOCKER_SANDBOX:
-            result = _run_python_script_docker(temp_file_path, user_path)
-        else:
-            result = _run_python_script(temp_file_path, user_path)
-
-        # Clean up temporary file
-        try:
-            os.unlink(temp_file_path)
-            if settings.DEBUG:
-                logger.debug(f"Cleaned up temporary file: {temp_file_path}")
-        except OSError as e:
-            logger.warning(f"Failed to clean up temporary file {temp_file_path}: {e}")
-
-        return result
+        with _EXEC_SEM:
+            if USE_DOCKER_SANDBOX:
+                return _run_python_script_docker(python_code, user_path)
+            return _run_python_script(python_code, user_path)
 
     except Exception as e:
-        logger.error(f"Error executing Python code: {e}")
+        logger.error("Error executing Python code: %s", e)
         return {
             'success': False,
             'error': f'Failed to execute Python code: {str(e)}',
@@ -86,35 +176,35 @@ def execute_python_code(user_dir: str, python_code: str) -> Dict[str, Any]:
         }
 
 
-def _run_python_script(script_path: str, working_dir: Path) -> Dict[str, Any]:
+def _run_python_script(python_code: str, working_dir: str) -> Dict[str, Any]:
     """
-    Run a Python script in a specific working directory.
+    Run Python code in a specific working directory.
     
     Args:
-        script_path (str): Path to the Python script
-        working_dir (Path): Working directory for execution
+        python_code (str): The Python code, fed to the interpreter on stdin
+        working_dir (str): Working directory for execution
         
     Returns:
         Dict[str, Any]: Execution results
     """
     try:
         # Debug logging
-        if settings.DEBUG:
-            logger.debug(f"Running script: {script_path}")
-            logger.debug(f"Working directory: {working_dir}")
+        logger.debug("Working directory: %s", working_dir)
         
-        # Run the script with timeout and capture output
+        # Run the code with timeout and capture output; "-" reads the
+        # program from stdin and keeps the working directory on sys.path
         result = subprocess.run(
-            [sys.executable, script_path],
+            [sys.executable, '-'],
+            input=python_code,
             cwd=working_dir,
             capture_output=True,
             text=True,
             timeout=30,  # 30 second timeout
-            env=os.environ.copy()
+            env=_CHILD_ENV
         )
         
         # Log execution results
-        logger.info(f"Script execution completed with return code: {result.returncode}")
+        logger.info("Script execution completed with return code: %s", result.returncode)
         
         return {
             'success': result.returncode == 0,
@@ -124,7 +214,7 @@ def _run_python_script(script_path: str, working_dir: Path) -> Dict[str, Any]:
         }
         
     except subprocess.TimeoutExpired:
-        logger.warning(f"Script execution timed out: {script_path}")
+        logger.warning("Script execution timed out in: %s", working_dir)
         return {
             'success': False,
             'error': 'Script execution timed out (30 seconds)',
@@ -132,7 +222,7 @@ def _run_python_script(script_path: str, working_dir: Path) -> Dict[str, Any]:
             'error_output': 'Execution timeout'
         }
     except Exception as e:
-        logger.error(f"Error running script {script_path}: {e}")
+        logger.error("Error running script in %s: %s", working_dir, e)
         return {
             'success': False,
             'error': f'Failed to run script: {str(e)}',
@@ -141,12 +231,12 @@ def _run_python_script(script_path: str, working_dir: Path) -> Dict[str, Any]:
         }
 
 
-def _run_python_script_docker(script_path: str, working_dir: Path) -> Dict[str, Any]:
+def _run_python_script_docker(python_code: str, working_dir: str) -> Dict[str, Any]:
     """
-    Run a Python script in a Docker container with the user's directory as the root.
+    Run Python code in a Docker container with the user's directory as the root.
     Args:
-        script_path (str): Path to the Python script
-        working_dir (Path): Working directory for execution (user's dir)
+        python_code (str): The Python code, fed to the container's stdin
+        working_dir (str): Working directory for execution (user's dir)
     Returns:
         Dict[str, Any]: Execution results
     """
@@ -154,29 +244,28 @@ def _run_python_script_docker(script_path: str, working_dir: Path) -> Dict[str,
     docker_image = "mcp-python-sandbox"
     # Only allow access to the user's directory
     container_workdir = "/sandbox"
-    script_name = os.path.basename(script_path)
-    # Build docker run command
+    # Build docker run command; -i keeps stdin open for the code
     command = [
-        "docker", "run", "--rm",
+        "docker", "run", "--rm", "-i",
         "--network=none",  # No network access
         "--memory=128m",   # Memory limit
         "--cpus=0.5",      # CPU limit
         "-v", f"{str(working_dir)}:{container_workdir}",
         "-w", container_workdir,
         docker_image,
-        "python", script_name
+        "python", "-"
     ]
     # Debug logging
-    if settings.DEBUG:
-        logger.debug(f"Running Docker command: {' '.join(command)}")
+    logger.debug("Running Docker command: %s", command)
     try:
         result = subprocess.run(
             command,
+            input=python_code,
             capture_output=True,
             text=True,
             timeout=30  # 30 second timeout
         )
-        logger.info(f"Docker script execution completed with return code: {result.returncode}")
+        logger.info("Docker script execution completed with return code: %s", result.returncode)
         return {
             'success': result.returncode == 0,
             'output': result.stdout,
@@ -184,7 +273,7 @@ def _run_python_script_docker(script_path: str, working_dir: Path) -> Dict[str,
             'return_code': result.returncode
         }
     except subprocess.TimeoutExpired:
-        logger.warning(f"Docker script execution timed out: {script_path}")
+        logger.warning("Docker script execution timed out in: %s", working_dir)
         return {
             'success': False,
             'error': 'Docker script execution timed out (30 seconds)',
@@ -192,7 +281,7 @@ def _run_python_script_docker(script_path: str, working_dir: Path) -> Dict[str,
             'error_output': 'Execution timeout'
         }
     except Exception as e:
-        logger.error(f"Error running Docker script {script_path}: {e}")
+        logger.error("Error running Docker script in %s: %s", working_dir, e)
         return {
             'success': False,
             'error': f'Failed to run Docker script: {str(e)}',
@@ -201,6 +290,41 @@ def _run_python_script_docker(script_path: str, working_dir: Path) -> Dict[str,
         }
 
 
+def _entry_info(entry: os.DirEntry, rel_path: str) -> Dict[str, Any]:
+    """
+    Describe a directory entry for a listing.
+    
+    Entry types come from the directory read itself (d_type on POSIX,
+    FindNextFile on Windows) and cost no syscall; only regular files are
+    lstat'ed, once, for their size. Symlinks are not followed, so a link
+    is neither a directory nor a file. Directories, the common case in a
+    walk, are settled by the first type test.
+    
+    Args:
+        entry (os.DirEntry): Entry yielded by os.scandir
+        rel_path (str): Path of the entry relative to the user directory
+        
+    Returns:
+        Dict[str, Any]: Name, path, type flags and size of the entry
+    """
+    if entry.is_dir(follow_symlinks=False):
+        return {
+            'name': entry.name,
+            'path': rel_path,
+            'is_dir': True,
+            'is_file': False,
+            'size': None
+        }
+    is_file = entry.is_file(follow_symlinks=False)
+    return {
+        'name': entry.name,
+        'path': rel_path,
+        'is_dir': False,
+        'is_file': is_file,
+        'size': entry.stat(follow_symlinks=False).st_size if is_file else None
+    }
+
+
 def list_directory(user_dir: str, target_dir: str = '') -> Dict[str, Any]:
     """
     List contents of a directory for a specific user.
@@ -213,13 +337,12 @@ def list_directory(user_dir: str, target_dir: str = '') -> Dict[str, Any]:
         Dict[str, Any]: Directory listing results
     """
     # Debug logging
-    if settings.DEBUG:
-        logger.debug(f"Listing directory for user_dir: {user_dir}, target_dir: {target_dir}")
+    logger.debug("Listing directory for user_dir: %s, target_dir: %s", user_dir, target_dir)
     
     # Validate user directory
-    user_path = Path(settings.MASTER_DIR) / user_dir
-    if not user_path.exists():
-        logger.error(f"User directory does not exist: {user_path}")
+    user_path = _resolve_user_dir(user_dir)
+    if user_path is None:
+        logger.error("User directory does not exist: %s", user_dir)
         return {
             'success': False,
             'error': f'User directory "{user_dir}" does not exist',
@@ -227,19 +350,19 @@ def list_directory(user_dir: str, target_dir: str = '') -> Dict[str, Any]:
         }
     
     # Build target path
-    target_path = user_path / target_dir if target_dir else user_path
+    target_path = _resolve_target_dir(user_path, target_dir)
     
     # Validate target path
-    if not target_path.exists():
-        logger.error(f"Target directory does not exist: {target_path}")
+    if target_path is None or not os.path.exists(target_path):
+        logger.error("Target directory does not exist: %s", target_path or target_dir)
         return {
             'success': False,
             'error': f'Target directory "{target_dir}" does not exist',
             'items': []
         }
     
-    if not target_path.is_dir():
-        logger.error(f"Target path is not a directory: {target_path}")
+    if not os.path.isdir(target_path):
+        logger.error("Target path is not a directory: %s", target_path)
         return {
             'success': False,
             'error': f'Target path "{target_dir}" is not a directory',
@@ -247,31 +370,35 @@ def list_directory(user_dir: str, target_dir: str = '') -> Dict[str, Any]:
         }
     
     try:
-        # List directory contents
-        items = []
-        for item in target_path.iterdir():
-            item_info = {
-                'name': item.name,
-                'path': str(item.relative_to(user_path)),
-                'is_dir': item.is_dir(),
-                'is_file': item.is_file(),
-                'size': item.stat().st_size if item.is_file() else None
-            }
-            items.append(item_info)
+        # Paths are reported relative to the user directory
+        rel_dir = _relative_to(target_path, user_path)
+        prefix = rel_dir + os.sep if rel_dir else ''
+        
+        # List directory contents as (lowercase name, entry info) pairs,
+        # directories and files apart
+        dirs = []
+        files = []
+        with os.scandir(target_path) as entries:
+            for entry in entries:
+                item_info = _entry_info(entry, prefix + entry.name)
+                (dirs if item_info['is_dir'] else files).append((entry.name.lower(), item_info))
         
-        # Sort items (directories first, then files)
-        items.sort(key=lambda x: (not x['is_dir'], x['name'].lower()))
+        # Sort items (directories first, then files), each group by name
+        dirs.sort(key=itemgetter(0))
+        files.sort(key=itemgetter(0))
+        items = [item_info for _, item_info in dirs]
+        items.extend(item_info for _, item_info in files)
         
-        logger.info(f"Successfully listed directory: {target_path} ({len(items)} items)")
+        logger.info("Successfully listed directory: %s (%s items)", target_path, len(items))
         
         return {
             'success': True,
             'items': items,
-            'path': str(target_path.relative_to(Path(settings.MASTER_DIR)))
+            'path': _relative_to(target_path, _MASTER_DIR)
         }
         
     except Exception as e:
-        logger.error(f"Error listing directory {target_path}: {e}")
+        logger.error("Error listing directory %s: %s", target_path, e)
         return {
             'success': False,
             'error': f'Failed to list directory: {str(e)}',
@@ -279,25 +406,130 @@ def list_directory(user_dir: str, target_dir: str = '') -> Dict[str, Any]:
         }
 
 
-def list_directory_recursively(user_dir: str, target_dir: str = '') -> Dict[str, Any]:
+@functools.lru_cache(maxsize=None)
+def _walk_executor() -> ThreadPoolExecutor:
     """
-    List contents of a directory recursively for a specific user.
+    Return the process-wide thread pool used to read directories ahead.
+    
+    Returns:
+        ThreadPoolExecutor: Pool sized by MCP_WALK_WORKERS
+    """
+    return ThreadPoolExecutor(max_workers=_WALK_WORKERS, thread_name_prefix='mcp-walk')
+
+
+def _scan_level(dir_path: str, rel_dir: str, depth: int) -> Optional[List[Tuple[str, Any, Any]]]:
+    """
+    Read one directory for the recursive walk.
+    
+    Args:
+        dir_path (str): Directory to read
+        rel_dir (str): Path of dir_path relative to the user directory
+        depth (int): Depth reported for the entries of dir_path
+        
+    Returns:
+        Optional[List[Tuple[str, Any, Any]]]: Work items of the directory in
+            descending key order, or None if it cannot be read
+    """
+    try:
+        entries = os.scandir(dir_path)
+    except PermissionError:
+        # Unreadable subdirectories are skipped, as rglob did
+        return None
+    prefix = rel_dir + os.sep if rel_dir else ''
+    level = []
+    with entries:
+        for entry in entries:
+            rel_path = prefix + entry.name
+            item_info = _entry_info(entry, rel_path)
+            item_info['depth'] = depth
+            level.append((rel_path, item_info, None))
+            if item_info['is_dir']:
+                level.append((rel_path + os.sep, None, (entry.path, rel_path, depth + 1)))
+    level.sort(key=itemgetter(0), reverse=True)
+    return level
+
+
+def _walk_sorted(dir_path: str, rel_dir: str, depth: int, after: str = '') -> Iterator[Dict[str, Any]]:
+    """
+    Yield the entries below a directory, in order of their relative path.
+    
+    Each directory is read and sorted on its own, and a subdirectory's
+    entries are placed at ``name + os.sep`` among its siblings, which is
+    exactly where sorting every path of the tree as a string puts them.
+    Only the directories along the current branch are held in memory.
+    
+    With MCP_WALK_WORKERS set, the next few subdirectories in walk order
+    are read ahead on a thread pool while earlier entries are yielded.
+    
+    Resuming after a path skips every subtree that sorts wholly before it
+    without reading it.
+    
+    Args:
+        dir_path (str): Directory to walk
+        rel_dir (str): Path of dir_path relative to the user directory
+        depth (int): Depth reported for the entries of dir_path
+        after (str): Only yield entries whose path sorts after this one
+        
+    Yields:
+        Dict[str, Any]: Entry info with its 'depth'
+    """
+    # Work stack of (sort key, entry info or None, subtree to walk or None),
+    # held in reverse so that pop() returns the smallest key
+    pending = [('', None, (dir_path, rel_dir, depth))]
+    # Read-ahead futures by subtree, at most _WALK_READAHEAD at a time
+    ahead = {}
+    while pending:
+        _, item_info, subtree = pending.pop()
+        if item_info is not None:
+            # Everything after the first yielded entry sorts after 'after'
+            after = ''
+            yield item_info
+            continue
+        future = ahead.pop(subtree, None)
+        level = future.result() if future is not None else _scan_level(*subtree)
+        if level is None:
+            continue
+        if after:
+            # Keep entries past the resume point, and subtrees that are
+            # past it or contain it
+            level = [
+                work for work in level
+                if work[0] > after or (work[2] is not None and after.startswith(work[0]))
+            ]
+        if _WALK_WORKERS > 0:
+            # The level is reversed; its first subdirectories come last
+            for _, _, sub in reversed(level):
+                if len(ahead) >= _WALK_READAHEAD:
+                    break
+                if sub is not None:
+                    ahead[sub] = _walk_executor().submit(_scan_level, *sub)
+        pending.extend(level)
+
+
+def iter_directory_recursively(user_dir: str, target_dir: str = '', after: str = '') -> Dict[str, Any]:
+    """
+    List contents of a directory recursively for a specific user, lazily.
+    
+    The directory is validated up front; on success 'items' is an iterator
+    that walks the tree as it is consumed, so a response can be streamed
+    without holding the whole listing. Items come sorted by path.
     
     Args:
         user_dir (str): The user's directory name in master_dir
         target_dir (str): The directory to list (empty for root)
+        after (str): Resume after this item path, as returned in a previous
+            listing (empty to start at the beginning)
         
     Returns:
         Dict[str, Any]: Recursive directory listing results
     """
     # Debug logging
-    if settings.DEBUG:
-        logger.debug(f"Listing directory recursively for user_dir: {user_dir}, target_dir: {target_dir}")
+    logger.debug("Listing directory recursively for user_dir: %s, target_dir: %s, after: %s", user_dir, target_dir, after)
     
     # Validate user directory
-    user_path = Path(settings.MASTER_DIR) / user_dir
-    if not user_path.exists():
-        logger.error(f"User directory does not exist: {user_path}")
+    user_path = _resolve_user_dir(user_dir)
+    if user_path is None:
+        logger.error("User directory does not exist: %s", user_dir)
         return {
             'success': False,
             'error': f'User directory "{user_dir}" does not exist',
@@ -305,58 +537,62 @@ def list_directory_recursively(user_dir: str, target_dir: str = '') -> Dict[str,
         }
     
     # Build target path
-    target_path = user_path / target_dir if target_dir else user_path
+    target_path = _resolve_target_dir(user_path, target_dir)
     
     # Validate target path
-    if not target_path.exists():
-        logger.error(f"Target directory does not exist: {target_path}")
+    if target_path is None or not os.path.exists(target_path):
+        logger.error("Target directory does not exist: %s", target_path or target_dir)
         return {
             'success': False,
             'error': f'Target directory "{target_dir}" does not exist',
             'items': []
         }
     
-    if not target_path.is_dir():
-        logger.error(f"Target path is not a directory: {target_path}")
+    if not os.path.isdir(target_path):
+        logger.error("Target path is not a directory: %s", target_path)
         return {
             'success': False,
             'error': f'Target path "{target_dir}" is not a directory',
             'items': []
         }
     
-    try:
-        # List directory contents recursively
-        items = []
-        for item in target_path.rglob('*'):
-            # Skip the target directory itself
-            if item == target_path:
-                continue
-                
-            item_info = {
-                'name': item.name,
-                'path': str(item.relative_to(user_path)),
-                'is_dir': item.is_dir(),
-                'is_file': item.is_file(),
-                'size': item.stat().st_size if item.is_file() else None,
-                'depth': len(item.relative_to(target_path).parts)
-            }
-            items.append(item_info)
-        
-        # Sort items by path
-        items.sort(key=lambda x: x['path'])
-        
-        logger.info(f"Successfully listed directory recursively: {target_path} ({len(items)} items)")
+    # Paths are reported relative to the user directory
+    rel_root = _relative_to(target_path, user_path)
+    
+    def items() -> Iterator[Dict[str, Any]]:
+        count = 0
+        for item_info in _walk_sorted(target_path, rel_root, 1, after):
+            count += 1
+            yield item_info
+        logger.info("Successfully listed directory recursively: %s (%s items)", target_path, count)
+    
+    return {
+        'success': True,
+        'items': items(),
+        'path': _relative_to(target_path, _MASTER_DIR)
+    }
+
+
+def list_directory_recursively(user_dir: str, target_dir: str = '') -> Dict[str, Any]:
+    """
+    List contents of a directory recursively for a specific user.
+    
+    Args:
+        user_dir (str): The user's directory name in master_dir
+        target_dir (str): The directory to list (empty for root)
         
-        return {
-            'success': True,
-            'items': items,
-            'path': str(target_path.relative_to(Path(settings.MASTER_DIR)))
-        }
+    Returns:
+        Dict[str, Any]: Recursive directory listing results
+    """
+    try:
+        result = iter_directory_recursively(user_dir, target_dir)
+        result['items'] = list(result['items'])
+        return result
         
     except Exception as e:
-        logger.error(f"Error listing directory recursively {target_path}: {e}")
+        logger.error("Error listing directory recursively %s/%s: %s", user_dir, target_dir, e)
         return {
             'success': False,
             'error': f'Failed to list directory recursively: {str(e)}',
             'items': []
-        } 
\ No newline at end of file
+        }
@@ -3,21 +3,234 @@ API views for MCP (Model Context Protocol) endpoints.
 This module provides views for Python code execution and directory operations.
 """
 
+import base64
 import json
 import logging
-from typing import Dict, Any
-from django.http import JsonResponse
+from itertools import islice
+from typing import Dict, Any, Iterable, Iterator, Optional
+from django.http import HttpResponse, JsonResponse, StreamingHttpResponse
 from django.views.decorators.csrf import csrf_exempt
 from django.views.decorators.http import require_http_methods
 from django.conf import settings
-from .utils import execute_python_code, list_directory, list_directory_recursively
+from .decorators import mcp_ip_required
+from .utils import execute_python_code, iter_directory_recursively, list_directory
+
+try:
+    import orjson
+except ImportError:  # optional dependency
+    orjson = None
 
 logger = logging.getLogger(settings.MCP_LOGGER)
 
 
+def _parse_json(body: bytes) -> Any:
+    """
+    Parse a JSON request body, with orjson when it is installed.
+    
+    Args:
+        body: Raw request body
+        
+    Returns:
+        Any: Decoded payload
+        
+    Raises:
+        json.JSONDecodeError: If the body is not valid JSON (orjson's error
+            type subclasses it)
+    """
+    if orjson is not None:
+        return orjson.loads(body)
+    return json.loads(body)
+
+
+def _json_response(data: Dict[str, Any]) -> HttpResponse:
+    """
+    Serialize a result payload, with orjson when it is installed.
+    
+    Directory listings can hold thousands of items, where orjson
+    encodes several times faster than the standard library and writes
+    bytes directly.
+    
+    Args:
+        data: Result payload
+        
+    Returns:
+        HttpResponse: JSON response
+    """
+    if orjson is not None:
+        return HttpResponse(orjson.dumps(data), content_type='application/json')
+    return JsonResponse(data)
+
+
+# Largest request body accepted, checked against Content-Length before the
+# body is read
+MAX_PAYLOAD_SIZE = 1024 * 1024
+
+# Longest python_code accepted, in characters; rejected before a process is
+# started for it
+MAX_PYTHON_CODE_LENGTH = 256 * 1024
+
+
+def _check_payload_size(request, view_name: str) -> Optional[JsonResponse]:
+    """
+    Reject a request whose declared body size exceeds MAX_PAYLOAD_SIZE
+    or cannot be parsed.
+    
+    Args:
+        request: The HTTP request object
+        view_name: View name used in log messages
+        
+    Returns:
+        Optional[JsonResponse]: None if the body may be read, otherwise the
+            400 or 413 response to return
+    """
+    try:
+        content_length = int(request.META.get('CONTENT_LENGTH') or 0)
+    except ValueError:
+        logger.error("MCP API: %s invalid Content-Length: %s", view_name, request.META.get('CONTENT_LENGTH'))
+        return JsonResponse({
+            'success': False,
+            'error': 'Invalid Content-Length header'
+        }, status=400)
+    if content_length > MAX_PAYLOAD_SIZE:
+        logger.error("MCP API: %s payload too large: %s bytes", view_name, content_length)
+        return JsonResponse({
+            'success': False,
+            'error': f'Payload exceeds {MAX_PAYLOAD_SIZE} bytes'
+        }, status=413)
+    return None
+
+
+# Items encoded per chunk of a streamed listing
+STREAM_BATCH_SIZE = 1000
+
+
+def _dumps(data: Any) -> bytes:
+    """Encode a value as JSON bytes, with orjson when it is installed."""
+    if orjson is not None:
+        return orjson.dumps(data)
+    return json.dumps(data).encode()
+
+
+def _stream_listing(items: Iterable[Dict[str, Any]], path: str) -> Iterator[bytes]:
+    """
+    Encode a successful listing as JSON, a batch of items at a time.
+    
+    The output has the same layout as the buffered response:
+    ``{"success": true, "items": [...], "path": "..."}``.
+    
+    Args:
+        items: Listing items, consumed lazily
+        path: Listed path relative to master_dir
+        
+    Yields:
+        bytes: Consecutive parts of the JSON document
+    """
+    yield b'{"success":true,"items":['
+    items = iter(items)
+    separator = b''
+    try:
+        while True:
+            batch = list(islice(items, STREAM_BATCH_SIZE))
+            if not batch:
+                break
+            # Encode the batch as one array and drop its brackets
+            yield separator + _dumps(batch)[1:-1]
+            separator = b','
+    except Exception as e:
+        # Headers are already sent; abort so the client gets a truncated
+        # body rather than a complete-looking partial listing
+        logger.error("MCP API: list_dir_recursively streaming error: %s", e)
+        raise
+    yield b'],"path":' + _dumps(path) + b'}'
+
+
+# Largest page a paginated recursive listing may request
+MAX_PAGE_SIZE = 10000
+
+
+def _encode_cursor(path: str) -> str:
+    """
+    Encode the last listed item path as an opaque pagination cursor.
+    
+    Listings are sorted by path, so the path alone says where to resume,
+    even if entries are added or removed between pages.
+    
+    Args:
+        path: Path of the last item on the page
+        
+    Returns:
+        str: URL-safe cursor
+    """
+    return base64.urlsafe_b64encode(path.encode('utf-8', 'surrogateescape')).decode('ascii')
+
+
+def _decode_cursor(cursor: str) -> str:
+    """
+    Decode a pagination cursor back to an item path.
+    
+    Args:
+        cursor: Cursor from a previous page's 'next_cursor'
+        
+    Returns:
+        str: Item path to resume after
+        
+    Raises:
+        ValueError: If the cursor is not valid base64 or UTF-8
+    """
+    return base64.b64decode(cursor, altchars=b'-_', validate=True).decode('utf-8', 'surrogateescape')
+
+
+# Payload fields per view as (name, required); every field must be a string
+_RUN_CODE_FIELDS = (('user_dir', True), ('python_code', True))
+_LIST_DIR_FIELDS = (('user_dir', True), ('dir_name', False))
+
+
+def _validate_payload(data: Any, fields: tuple, view_name: str) -> Optional[JsonResponse]:
+    """
+    Validate a decoded payload against a view's field table.
+    
+    Required fields are checked for presence first, then every present
+    field for its type, in table order.
+    
+    Args:
+        data: Decoded JSON payload
+        fields: (name, required) pairs for the view
+        view_name: View name used in log messages
+        
+    Returns:
+        Optional[JsonResponse]: None if the payload is valid, otherwise the
+            400 response to return
+    """
+    if not isinstance(data, dict):
+        logger.error("MCP API: %s payload is not a JSON object", view_name)
+        return JsonResponse({
+            'success': False,
+            'error': 'Payload must be a JSON object'
+        }, status=400)
+    
+    for name, required in fields:
+        if required and name not in data:
+            logger.error("MCP API: %s missing '%s' field", view_name, name)
+            return JsonResponse({
+                'success': False,
+                'error': f'Missing required field: {name}'
+            }, status=400)
+    
+    for name, _ in fields:
+        if name in data and not isinstance(data[name], str):
+            logger.error("MCP API: %s '%s' must be a string", view_name, name)
+            return JsonResponse({
+                'success': False,
+                'error': f'{name} must be a string'
+            }, status=400)
+    
+    return None
+
+
 @csrf_exempt
+@mcp_ip_required
 @require_http_methods(["POST"])
-def run_python_code_view(request) -> JsonResponse:
+def run_python_code_view(request) -> HttpResponse:
     """
     Execute Python code in a user's directory.
     
@@ -31,70 +244,55 @@ def run_python_code_view(request) -> JsonResponse:
         request: The HTTP request object
         
     Returns:
-        JsonResponse: Execution results in JSON format
+        HttpResponse: Execution results in JSON format
     """
     # Debug logging
-    if settings.DEBUG:
-        logger.debug(f"MCP API: run_python_code request received from {request.META.get('REMOTE_ADDR', 'unknown')}")
+    logger.debug("MCP API: run_python_code request received from %s", request.META.get('REMOTE_ADDR', 'unknown'))
+    
+    # Refuse oversized bodies before reading them
+    error_response = _check_payload_size(request, 'run_python_code')
+    if error_response is not None:
+        return error_response
     
     try:
         # Parse JSON payload
-        data = json.loads(request.body)
-        
-        # Debug logging
-        if settings.DEBUG:
-            logger.debug(f"MCP API: run_python_code payload keys: {list(data.keys())}")
+        data = _parse_json(request.body)
         
-        # Validate required fields
-        if 'user_dir' not in data:
-            logger.error("MCP API: run_python_code missing 'user_dir' field")
-            return JsonResponse({
-                'success': False,
-                'error': 'Missing required field: user_dir'
-            }, status=400)
+        # Validate fields
+        error_response = _validate_payload(data, _RUN_CODE_FIELDS, 'run_python_code')
+        if error_response is not None:
+            return error_response
         
-        if 'python_code' not in data:
-            logger.error("MCP API: run_python_code missing 'python_code' field")
-            return JsonResponse({
-                'success': False,
-                'error': 'Missing required field: python_code'
-            }, status=400)
+        # Debug logging
+        logger.debug("MCP API: run_python_code payload keys: %s", data.keys())
         
         user_dir = data['user_dir']
         python_code = data['python_code']
         
-        # Validate data types
-        if not isinstance(user_dir, str):
-            logger.error("MCP API: run_python_code 'user_dir' must be a string")
+        if len(python_code) > MAX_PYTHON_CODE_LENGTH:
+            logger.error("MCP API: run_python_code code too long: %s characters", len(python_code))
             return JsonResponse({
                 'success': False,
-                'error': 'user_dir must be a string'
-            }, status=400)
-        
-        if not isinstance(python_code, str):
-            logger.error("MCP API: run_python_code 'python_code' must be a string")
-            return JsonResponse({
-                'success': False,
-                'error': 'python_code must be a string'
-            }, status=400)
+                'error': f'python_code exceeds {MAX_PYTHON_CODE_LENGTH} characters'
+            }, status=413)
         
         # Log the request
-        logger.info(f"MCP API: Executing Python code for user_dir: {user_dir}")
+        logger.info("MCP API: Executing Python code for user_dir: %s", user_dir)
         
         # Execute the Python code
         result = execute_python_code(user_dir, python_code)
         
         # Return the result
-        return JsonResponse(result)
+        return _json_response(result)
         
     except json.JSONDecodeError as e:
-        logger.error(f"MCP API: run_python_code JSON decode error: {e}")
+        logger.error("MCP API: run_python_code JSON decode error: %s", e)
         return JsonResponse({
             'success': False,
             'error': 'Invalid JSON payload'
         }, status=400)
     except Exception as e:
-        logger.error(f"MCP API: run_python_code unexpected error: {e}")
+        logger.error("MCP API: run_python_code unexpected error: %s", e)
         return JsonResponse({
             'success': False,
             'error': f'Unexpected error: {str(e)}'
@@ -102,8 +300,9 @@ def run_python_code_view(request) -> JsonResponse:
 
 
 @csrf_exempt
+@mcp_ip_required
 @require_http_methods(["POST"])
-def list_dir_view(request) -> JsonResponse:
+def list_dir_view(request) -> HttpResponse:
     # return JsonResponse(data= {"asd" : "asd"}, status=200)
     """
     List contents of a directory for a specific user.
@@ -118,63 +317,48 @@ def list_dir_view(request) -> JsonResponse:
         request: The HTTP request object
         
     Returns:
-        JsonResponse: Directory listing in JSON format
+        HttpResponse: Directory listing in JSON format
     """
     # Debug logging
-    if settings.DEBUG:
-        logger.debug(f"MCP API: list_dir request received from {request.META.get('REMOTE_ADDR', 'unknown')}")
+    logger.debug("MCP API: list_dir request received from %s", request.META.get('REMOTE_ADDR', 'unknown'))
+    
+    # Refuse oversized bodies before reading them
+    error_response = _check_payload_size(request, 'list_dir')
+    if error_response is not None:
+        return error_response
     
     try:
         # Parse JSON payload
-        data = json.loads(request.body)
+        data = _parse_json(request.body)
         
-        # Debug logging
-        if settings.DEBUG:
-            logger.debug(f"MCP API: list_dir payload keys: {list(data.keys())}")
+        # Validate fields
+        error_response = _validate_payload(data, _LIST_DIR_FIELDS, 'list_dir')
+        if error_response is not None:
+            return error_response
         
-        # Validate required fields
-        if 'user_dir' not in data:
-            logger.error("MCP API: list_dir missing 'user_dir' field")
-            return JsonResponse({
-                'success': False,
-                'error': 'Missing required field: user_dir'
-            }, status=400)
+        # Debug logging
+        logger.debug("MCP API: list_dir payload keys: %s", data.keys())
         
         user_dir = data['user_dir']
         dir_name = data.get('dir_name', '')  # Optional field
         
-        # Validate data types
-        if not isinstance(user_dir, str):
-            logger.error("MCP API: list_dir 'user_dir' must be a string")
-            return JsonResponse({
-                'success': False,
-                'error': 'user_dir must be a string'
-            }, status=400)
-        
-        if not isinstance(dir_name, str):
-            logger.error("MCP API: list_dir 'dir_name' must be a string")
-            return JsonResponse({
-                'success': False,
-                'error': 'dir_name must be a string'
-            }, status=400)
-        
         # Log the request
-        logger.info(f"MCP API: Listing directory for user_dir: {user_dir}, dir_name: {dir_name}")
+        logger.info("MCP API: Listing directory for user_dir: %s, dir_name: %s", user_dir, dir_name)
         
         # List the directory
         result = list_directory(user_dir, dir_name)
         
         # Return the result
-        return JsonResponse(result)
+        return _json_response(result)
         
     except json.JSONDecodeError as e:
-        logger.error(f"MCP API: list_dir JSON decode error: {e}")
+        logger.error("MCP API: list_dir JSON decode error: %s", e)
         return JsonResponse({
             'success': False,
             'error': 'Invalid JSON payload'
         }, status=400)
     except Exception as e:
-        logger.error(f"MCP API: list_dir unexpected error: {e}")
+        logger.error("MCP API: list_dir unexpected error: %s", e)
         return JsonResponse({
             'success': False,
             'error': f'Unexpected error: {str(e)}'
@@ -182,8 +366,9 @@ def list_dir_view(request) -> JsonResponse:
 
 
 @csrf_exempt
+@mcp_ip_required
 @require_http_methods(["POST"])
-def list_dir_recursively_view(request) -> JsonResponse:
+def list_dir_recursively_view(request) -> HttpResponse:
     """
     List contents of a directory recursively for a specific user.
     
@@ -193,67 +378,94 @@ def list_dir_recursively_view(request) -> JsonResponse:
         "dir_name": "optional_subdirectory"
     }
     
+    Optional query parameters:
+        page_size: Return at most this many items, with a 'next_cursor'
+            for the rest (null on the last page)
+        cursor: 'next_cursor' of the previous page
+    
     Args:
         request: The HTTP request object
         
     Returns:
-        JsonResponse: Recursive directory listing in JSON format
+        HttpResponse: Recursive directory listing in JSON format, streamed
+            on success unless paginated
     """
     # Debug logging
-    if settings.DEBUG:
-        logger.debug(f"MCP API: list_dir_recursively request received from {request.META.get('REMOTE_ADDR', 'unknown')}")
+    logger.debug("MCP API: list_dir_recursively request received from %s", request.META.get('REMOTE_ADDR', 'unknown'))
+    
+    # Refuse oversized bodies before reading them
+    error_response = _check_payload_size(request, 'list_dir_recursively')
+    if error_response is not None:
+        return error_response
     
     try:
         # Parse JSON payload
-        data = json.loads(request.body)
+        data = _parse_json(request.body)
         
-        # Debug logging
-        if settings.DEBUG:
-            logger.debug(f"MCP API: list_dir_recursively payload keys: {list(data.keys())}")
+        # Validate fields
+        error_response = _validate_payload(data, _LIST_DIR_FIELDS, 'list_dir_recursively')
+        if error_response is not None:
+            return error_response
         
-        # Validate required fields
-        if 'user_dir' not in data:
-            logger.error("MCP API: list_dir_recursively missing 'user_dir' field")
-            return JsonResponse({
-                'success': False,
-                'error': 'Missing required field: user_dir'
-            }, status=400)
+        # Debug logging
+        logger.debug("MCP API: list_dir_recursively payload keys: %s", data.keys())
         
         user_dir = data['user_dir']
         dir_name = data.get('dir_name', '')  # Optional field
         
-        # Validate data types
-        if not isinstance(user_dir, str):
-            logger.error("MCP API: list_dir_recursively 'user_dir' must be a string")
-            return JsonResponse({
-                'success': False,
-                'error': 'user_dir must be a string'
-            }, status=400)
-        
-        if not isinstance(dir_name, str):
-            logger.error("MCP API: list_dir_recursively 'dir_name' must be a string")
+        # Pagination parameters
+        page_size = request.GET.get('page_size')
+        if page_size is not None:
+            try:
+                page_size = int(page_size)
+            except ValueError:
+                page_size = 0
+            if not 1 <= page_size <= MAX_PAGE_SIZE:
+                logger.error("MCP API: list_dir_recursively invalid page_size: %s", request.GET['page_size'])
+                return JsonResponse({
+                    'success': False,
+                    'error': f'page_size must be an integer between 1 and {MAX_PAGE_SIZE}'
+                }, status=400)
+        try:
+            after = _decode_cursor(request.GET.get('cursor', ''))
+        except ValueError:
+            logger.error("MCP API: list_dir_recursively invalid cursor")
             return JsonResponse({
                 'success': False,
-                'error': 'dir_name must be a string'
+                'error': 'Invalid cursor'
             }, status=400)
         
         # Log the request
-        logger.info(f"MCP API: Listing directory recursively for user_dir: {user_dir}, dir_name: {dir_name}")
+        logger.info("MCP API: Listing directory recursively for user_dir: %s, dir_name: %s", user_dir, dir_name)
         
         # List the directory recursively
-        result = list_directory_recursively(user_dir, dir_name)
+        result = iter_directory_recursively(user_dir, dir_name, after)
+        if not result['success']:
+            return _json_response(result)
         
-        # Return the result
-        return JsonResponse(result)
+        if page_size is not None:
+            # Walk one item past the page to learn whether another follows
+            page = list(islice(result['items'], page_size + 1))
+            result['next_cursor'] = _encode_cursor(page[page_size - 1]['path']) if len(page) > page_size else None
+            result['items'] = page[:page_size]
+            logger.info("MCP API: list_dir_recursively returned a page of %s items", len(result['items']))
+            return _json_response(result)
+        
+        # A full listing is streamed as the tree is walked instead of being
+        # built up in memory
+        return StreamingHttpResponse(
+            _stream_listing(result['items'], result['path']),
+            content_type='application/json'
+        )
         
     except json.JSONDecodeError as e:
-        logger.error(f"MCP API: list_dir_recursively JSON decode error: {e}")
+        logger.error("MCP API: list_dir_recursively JSON decode error: %s", e)
         return JsonResponse({
             'success': False,
             'error': 'Invalid JSON payload'
         }, status=400)
     except Exception as e:
-        logger.error(f"MCP API: list_dir_recursively unexpected error: {e}")
+        logger.error("MCP API: list_dir_recursively unexpected error: %s", e)
         return JsonResponse({
             'success': False,
             'error': f'Unexpected error: {str(e)}'
@@ -42,6 +42,7 @@ INSTALLED_APPS = [
     # Third party apps
     "rest_framework",
     "rest_framework_simplejwt",
+    "rest_framework_simplejwt.token_blacklist",
     # Local apps
     "auth_app",
     "file_manager_core",
@@ -62,7 +63,6 @@ MIDDLEWARE = [
     "django.contrib.auth.middleware.AuthenticationMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
-    "mcp_api.middleware.MCPIPAuthenticationMiddleware",
 ]
 
 ROOT_URLCONF = "project.urls"
@@ -96,6 +96,14 @@ DATABASES = {
 }
 
 
+# Authentication backends
+# https://docs.djangoproject.com/en/5.2/ref/settings/#authentication-backends
+
+AUTHENTICATION_BACKENDS = [
+    "auth_app.backends.ProfileModelBackend",
+]
+
+
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
 
@@ -140,11 +148,15 @@ DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 # REST Framework Configuration
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'auth_app.authentication.ProfileJWTAuthentication',
     ),
     'DEFAULT_PERMISSION_CLASSES': (
         'rest_framework.permissions.IsAuthenticated',
     ),
+    'DEFAULT_RENDERER_CLASSES': (
+        'file_manager_core.renderers.ORJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ),
 }
 
 # JWT Settings
@@ -173,10 +185,30 @@ SIMPLE_JWT = {
     'JTI_CLAIM': 'jti',
 }
 
+# Cache
+# Authentication keeps each user (with profile) here for
+# auth_app.models.USER_CACHE_TIMEOUT (30) seconds. The default local-memory
+# cache is per process: saving or deactivating a user, or changing a
+# password, drops the cached user only in the process that made the change,
+# and other workers keep authenticating the stale user until the entry
+# expires. Deployments running several workers should use a shared backend,
+# e.g. CACHE_BACKEND=django.core.cache.backends.redis.RedisCache with
+# CACHE_LOCATION=redis://127.0.0.1:6379
+CACHES = {
+    'default': {
+        'BACKEND': config('CACHE_BACKEND', default='django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': config('CACHE_LOCATION', default=''),
+    }
+}
+
 # File Manager Settings
 MASTER_DIR = config('MASTER_DIR', default=str(BASE_DIR / 'master_dir'))
 FILE_UPLOAD_MAX_MEMORY_SIZE = 10 * 1024 * 1024  # 10MB
 DATA_UPLOAD_MAX_MEMORY_SIZE = 10 * 1024 * 1024  # 10MB
+# Threads used to stat directory entries in parallel when listing. Leave at 0
+# for local disks; raise it when MASTER_DIR is on NFS/SMB, where each stat is
+# a network round-trip
+LIST_DIRECTORY_STAT_WORKERS = config('LIST_DIRECTORY_STAT_WORKERS', default=0, cast=int)
 
 # Logging Configuration
 LOGGING = {
@@ -237,3 +269,7 @@ os.makedirs(BASE_DIR / 'logs', exist_ok=True)
 # MCP API Settings
 MCP_ALLOWED_IPS = config('MCP_ALLOWED_IPS', default='127.0.0.1', cast=lambda v: [s.strip() for s in v.split(',')])
 MCP_LOGGER = 'mcp_api'
+# Threads that read directories ahead during recursive MCP listings. Leave at
+# 0 for local disks; raise it when MASTER_DIR is on NFS/SMB, where each
+# directory read is a network round-trip
+MCP_WALK_WORKERS = config('MCP_WALK_WORKERS', default=0, cast=int)
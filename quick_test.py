@@ -8,6 +8,9 @@ import json
 
 BASE_URL = "http://localhost:8000/api"
 
+# One keep-alive connection for the whole run
+SESSION = requests.Session()
+
 def test_copy_move():
     """Test copy and move operations."""
     
@@ -22,7 +25,7 @@ def test_copy_move():
         "last_name": "Test"
     }
     
-    response = requests.post(f"{BASE_URL}/auth/register/", json=user_data)
+    response = SESSION.post(f"{BASE_URL}/auth/register/", json=user_data)
     if response.status_code != 201:
         if 'already exists' in response.text:
             print("User already exists, skipping registration.")
@@ -36,24 +39,24 @@ def test_copy_move():
         "password": "testpass123"
     }
     
-    response = requests.post(f"{BASE_URL}/auth/login/", json=login_data)
+    response = SESSION.post(f"{BASE_URL}/auth/login/", json=login_data)
     if response.status_code != 200:
         print(f"Login failed: {response.text}")
         return
     
     tokens = response.json()
     access_token = tokens['access']
-    headers = {"Authorization": f"Bearer {access_token}"}
+    SESSION.headers.update({"Authorization": f"Bearer {access_token}"})
     
     print("3. Creating test folder...")
     folder_data = {"parent_path": "", "folder_name": "quick_test"}
-    response = requests.post(f"{BASE_URL}/files/create-folder/", json=folder_data, headers=headers)
+    response = SESSION.post(f"{BASE_URL}/files/create-folder/", json=folder_data)
     print(f"Create folder: {response.status_code}")
     
     print("4. Uploading test file...")
     files = {'files': ('testfile.txt', 'This is a test file for copy/move operations.', 'text/plain')}
     data = {'path': 'quick_test'}
-    response = requests.post(f"{BASE_URL}/files/upload/", files=files, data=data, headers=headers)
+    response = SESSION.post(f"{BASE_URL}/files/upload/", files=files, data=data)
     print(f"Upload file: {response.status_code}")
     
     print("5. Testing copy operation...")
@@ -61,7 +64,7 @@ def test_copy_move():
         "source_path": "quick_test\\testfile.txt",
         "dest_path": "quick_test"
     }
-    response = requests.post(f"{BASE_URL}/files/copy/", json=copy_data, headers=headers)
+    response = SESSION.post(f"{BASE_URL}/files/copy/", json=copy_data)
     print(f"Copy operation: {response.status_code}")
     if response.status_code == 200:
         print(f"Copy response: {response.json()}")
@@ -73,7 +76,7 @@ def test_copy_move():
         "source_path": "quick_test\\testfile.txt",
         "dest_path": ""
     }
-    response = requests.post(f"{BASE_URL}/files/move/", json=move_data, headers=headers)
+    response = SESSION.post(f"{BASE_URL}/files/move/", json=move_data)
     print(f"Move operation: {response.status_code}")
     if response.status_code == 200:
         print(f"Move response: {response.json()}")
@@ -81,7 +84,7 @@ def test_copy_move():
         print(f"Move error: {response.text}")
     
     print("7. Listing final directory...")
-    response = requests.get(f"{BASE_URL}/files/list/", headers=headers)
+    response = SESSION.get(f"{BASE_URL}/files/list/")
     print(f"List directory: {response.status_code}")
     if response.status_code == 200:
         print(f"Directory contents: {response.json()}")
@@ -8,6 +8,7 @@ import requests
 import json
 import os
 import time
+from concurrent.futures import ThreadPoolExecutor
 
 # Configuration
 BASE_URL = "http://localhost:8000/api"
@@ -20,6 +21,10 @@ TEST_USER = {
     "last_name": "User"
 }
 
+# One keep-alive connection for the whole run; the auth header is set on it
+# after login
+SESSION = requests.Session()
+
 def print_response(response, title):
     """Print formatted response."""
     print(f"\n{'='*50}")
@@ -31,13 +36,19 @@ def print_response(response, title):
     except:
         print(f"Response: {response.text}")
 
+def send_concurrently(*calls):
+    """Send independent requests at once; responses come back in call order."""
+    with ThreadPoolExecutor(max_workers=len(calls)) as pool:
+        futures = [pool.submit(SESSION.request, method, url) for method, url in calls]
+        return [future.result() for future in futures]
+
 def test_auth_endpoints():
     """Test authentication endpoints."""
     print("Testing Authentication Endpoints...")
     
     # Test 1: Register new user
     print("\n1. Testing User Registration...")
-    response = requests.post(f"{BASE_URL}/auth/register/", json=TEST_USER)
+    response = SESSION.post(f"{BASE_URL}/auth/register/", json=TEST_USER)
     print_response(response, "User Registration")
     
     if response.status_code == 201:
@@ -52,48 +63,49 @@ def test_auth_endpoints():
         "username": TEST_USER["username"],
         "password": TEST_USER["password"]
     }
-    response = requests.post(f"{BASE_URL}/auth/login/", json=login_data)
+    response = SESSION.post(f"{BASE_URL}/auth/login/", json=login_data)
     print_response(response, "User Login")
     
     if response.status_code == 200:
         tokens = response.json()
         access_token = tokens.get('access')
+        SESSION.headers.update({"Authorization": f"Bearer {access_token}"})
         print("✅ Login successful")
         return access_token
     else:
         print("❌ Login failed")
         return None
 
-def test_user_endpoints(access_token):
+def test_user_endpoints():
     """Test user management endpoints."""
     print("\nTesting User Management Endpoints...")
     
-    headers = {"Authorization": f"Bearer {access_token}"}
+    # Tests 1-3 are independent and run concurrently
+    profile, user_info, auth_test = send_concurrently(
+        ("GET", f"{BASE_URL}/auth/profile/"),
+        ("GET", f"{BASE_URL}/auth/user-info/"),
+        ("POST", f"{BASE_URL}/auth/test-auth/"),
+    )
     
     # Test 1: Get user profile
     print("\n1. Testing Get User Profile...")
-    response = requests.get(f"{BASE_URL}/auth/profile/", headers=headers)
-    print_response(response, "Get User Profile")
+    print_response(profile, "Get User Profile")
     
     # Test 2: Get user info
     print("\n2. Testing Get User Info...")
-    response = requests.get(f"{BASE_URL}/auth/user-info/", headers=headers)
-    print_response(response, "Get User Info")
+    print_response(user_info, "Get User Info")
     
     # Test 3: Test auth endpoint
     print("\n3. Testing Auth Test Endpoint...")
-    response = requests.post(f"{BASE_URL}/auth/test-auth/", headers=headers)
-    print_response(response, "Auth Test")
+    print_response(auth_test, "Auth Test")
 
-def test_file_endpoints(access_token):
+def test_file_endpoints():
     """Test file management endpoints."""
     print("\nTesting File Management Endpoints...")
     
-    headers = {"Authorization": f"Bearer {access_token}"}
-    
     # Test 1: List directory (should be empty initially)
     print("\n1. Testing List Directory...")
-    response = requests.get(f"{BASE_URL}/files/list/", headers=headers)
+    response = SESSION.get(f"{BASE_URL}/files/list/")
     print_response(response, "List Directory")
     
     # Test 2: Create folder
@@ -102,12 +114,12 @@ def test_file_endpoints(access_token):
         "parent_path": "",
         "folder_name": "test_folder"
     }
-    response = requests.post(f"{BASE_URL}/files/create-folder/", json=folder_data, headers=headers)
+    response = SESSION.post(f"{BASE_URL}/files/create-folder/", json=folder_data)
     print_response(response, "Create Folder")
     
     # Test 3: List directory again (should show the new folder)
     print("\n3. Testing List Directory (after creating folder)...")
-    response = requests.get(f"{BASE_URL}/files/list/", headers=headers)
+    response = SESSION.get(f"{BASE_URL}/files/list/")
     print_response(response, "List Directory (Updated)")
     
     # Test 4: Create a test file
@@ -115,12 +127,12 @@ def test_file_endpoints(access_token):
     test_file_content = "This is a test file content."
     files = {'files': ('test.txt', test_file_content, 'text/plain')}
     data = {'path': 'test_folder'}
-    response = requests.post(f"{BASE_URL}/files/upload/", files=files, data=data, headers=headers)
+    response = SESSION.post(f"{BASE_URL}/files/upload/", files=files, data=data)
     print_response(response, "File Upload")
     
     # Test 5: List directory in test_folder
     print("\n5. Testing List Directory in test_folder...")
-    response = requests.get(f"{BASE_URL}/files/list/?path=test_folder", headers=headers)
+    response = SESSION.get(f"{BASE_URL}/files/list/?path=test_folder")
     print_response(response, "List Directory in test_folder")
     
     # Test 6: Rename file
@@ -129,7 +141,7 @@ def test_file_endpoints(access_token):
         "old_path": "test_folder\\test.txt",
         "new_name": "renamed_test.txt"
     }
-    response = requests.post(f"{BASE_URL}/files/rename/", json=rename_data, headers=headers)
+    response = SESSION.post(f"{BASE_URL}/files/rename/", json=rename_data)
     print_response(response, "Rename File")
     
     # Test 7: Copy file
@@ -138,7 +150,7 @@ def test_file_endpoints(access_token):
         "source_path": "test_folder\\renamed_test.txt",
         "dest_path": ""
     }
-    response = requests.post(f"{BASE_URL}/files/copy/", json=copy_data, headers=headers)
+    response = SESSION.post(f"{BASE_URL}/files/copy/", json=copy_data)
     print_response(response, "Copy File")
     
     # Test 8: Move file
@@ -147,30 +159,34 @@ def test_file_endpoints(access_token):
         "source_path": "renamed_test.txt",
         "dest_path": "test_folder"
     }
-    response = requests.post(f"{BASE_URL}/files/move/", json=move_data, headers=headers)
+    response = SESSION.post(f"{BASE_URL}/files/move/", json=move_data)
     print_response(response, "Move File")
     
+    # Tests 9-11 only read and run concurrently
+    listing, download, zip_download = send_concurrently(
+        ("GET", f"{BASE_URL}/files/list/"),
+        ("GET", f"{BASE_URL}/files/download/?path=test_folder\\renamed_test.txt"),
+        ("GET", f"{BASE_URL}/files/download-zip/?path=test_folder"),
+    )
+    
     # Test 9: Final directory listing
     print("\n9. Testing Final Directory Listing...")
-    response = requests.get(f"{BASE_URL}/files/list/", headers=headers)
-    print_response(response, "Final Directory Listing")
+    print_response(listing, "Final Directory Listing")
     
     # Test 10: Download file
     print("\n10. Testing File Download...")
-    response = requests.get(f"{BASE_URL}/files/download/?path=test_folder\\renamed_test.txt", headers=headers)
-    print_response(response, "File Download")
+    print_response(download, "File Download")
     
     # Test 11: Download ZIP
     print("\n11. Testing ZIP Download...")
-    response = requests.get(f"{BASE_URL}/files/download-zip/?path=test_folder", headers=headers)
-    print_response(response, "ZIP Download")
+    print_response(zip_download, "ZIP Download")
     
     # Test 12: Delete file
     print("\n12. Testing Delete File...")
     delete_data = {
         "path": "test_folder\\renamed_test.txt"
     }
-    response = requests.post(f"{BASE_URL}/files/delete/", json=delete_data, headers=headers)
+    response = SESSION.post(f"{BASE_URL}/files/delete/", json=delete_data)
     print_response(response, "Delete File")
     
     # Test 13: Delete folder
@@ -178,7 +194,7 @@ def test_file_endpoints(access_token):
     delete_data = {
         "path": "test_folder"
     }
-    response = requests.post(f"{BASE_URL}/files/delete/", json=delete_data, headers=headers)
+    response = SESSION.post(f"{BASE_URL}/files/delete/", json=delete_data)
     print_response(response, "Delete Folder")
 
 def main():
@@ -188,7 +204,7 @@ def main():
     
     # Check if server is running
     try:
-        response = requests.get(f"{BASE_URL}/auth/test-auth/")
+        response = SESSION.get(f"{BASE_URL}/auth/test-auth/")
         print("✅ Server is running")
     except requests.exceptions.ConnectionError:
         print("❌ Server is not running. Please start the server first:")
@@ -202,10 +218,10 @@ def main():
         return
     
     # Test user endpoints
-    test_user_endpoints(access_token)
+    test_user_endpoints()
     
     # Test file endpoints
-    test_file_endpoints(access_token)
+    test_file_endpoints()
     
     print("\n🎉 All tests completed!")
     print("\nTo clean up, you can delete the test user through the admin interface:")
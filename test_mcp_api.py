@@ -2,131 +2,230 @@
 """
 Test script for MCP API functionality.
 This script tests all three MCP API endpoints.
+
+Run it directly, or collect the test_* functions with pytest
+(``pytest test_mcp_api.py``, or ``pytest -n auto`` with pytest-xdist).
+Either way the Django server must already be running.
 """
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import argparse
+import functools
+import hashlib
+import io
 import json
+import os
+import socket
 import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+
+try:
+    import orjson
+except ImportError:  # optional dependency
+    orjson = None
 
 # Configuration
 BASE_URL = "http://127.0.0.1:8000"
 TEST_USER_DIR = "test_user"
+# (connect, read) timeouts in seconds for every request
+TIMEOUT = (3, 10)
+# Print full indented responses rather than a checksum of each body; set
+# with --verbose, or the VERBOSE environment variable under pytest
+VERBOSE = bool(os.environ.get("VERBOSE"))
+
+# Request URLs and bodies, built once. The MCP routes end in a slash; without
+# it Django would try to redirect the POST
+_URL_RUN = f"{BASE_URL}/mcp_api/run_python_code/"
+_URL_LIST = f"{BASE_URL}/mcp_api/list_dir/"
+_URL_LIST_R = f"{BASE_URL}/mcp_api/list_dir_recursively/"
+_BODY_RUN = json.dumps({
+    "user_dir": TEST_USER_DIR,
+    "python_code": "print('Hello from MCP API!')\nprint('Current directory:', __import__('os').getcwd())\nprint('Python version:', __import__('sys').version)"
+}).encode()
+_BODY_LIST = json.dumps({"user_dir": TEST_USER_DIR, "dir_name": ""}).encode()
+# Items per page when walking a recursive listing
+PAGE_SIZE = 1000
+_JSON_HEADERS = {"Content-Type": "application/json"}
+
+# Shared keep-alive connection pool for all tests. Connection errors and
+# gateway errors are retried on the pooled connection; once retries run out
+# the last response is returned so the test reports its status
+SESSION = requests.Session()
+SESSION.mount("http://", HTTPAdapter(
+    pool_connections=4,
+    pool_maxsize=8,
+    max_retries=Retry(
+        total=3,
+        backoff_factor=0.1,
+        status_forcelist=(502, 503, 504),
+        allowed_methods=frozenset(["GET", "POST"]),
+        raise_on_status=False
+    )
+))
+
+def _loads(content):
+    """Decode a JSON response body."""
+    if orjson is not None:
+        return orjson.loads(content)
+    return json.loads(content)
+
+def _pretty_json(content):
+    """Decode a JSON response body and re-encode it indented for printing."""
+    if orjson is not None:
+        return orjson.dumps(orjson.loads(content), option=orjson.OPT_INDENT_2).decode()
+    return json.dumps(json.loads(content), indent=2)
+
+def _describe(content):
+    """Format a response body for printing: indented JSON when verbose, else its checksum."""
+    if VERBOSE:
+        return f"Response: {_pretty_json(content)}"
+    return f"Response hash: {hashlib.blake2b(content, digest_size=16).hexdigest()}"
+
+# Output of the test running on this thread, when run from main()
+_OUTPUT = threading.local()
+_STDOUT_LOCK = threading.Lock()
+
+def _print(*args):
+    """Print to the running test's buffer, or to stdout outside main()."""
+    print(*args, file=getattr(_OUTPUT, "buffer", None) or sys.stdout)
+
+def _post(url, body, **kwargs):
+    """POST a pre-encoded JSON body on the shared session."""
+    return SESSION.post(url, data=body, headers=_JSON_HEADERS, timeout=TIMEOUT, **kwargs)
+
+def _check_endpoint(name, url, body):
+    """POST to an endpoint, print the response, and assert it answered 200."""
+    _print(f"\nTesting {name} endpoint...")
+    
+    response = _post(url, body)
+    _print(f"Status Code: {response.status_code}")
+    _print(_describe(response.content))
+    assert response.status_code == 200, f"expected status 200, got {response.status_code}"
+    return response
 
 def test_run_python_code():
     """Test the run_python_code endpoint."""
-    print("Testing run_python_code endpoint...")
-    
-    url = f"{BASE_URL}/mcp_api/run_python_code"
-    payload = {
-        "user_dir": TEST_USER_DIR,
-        "python_code": "print('Hello from MCP API!')\nprint('Current directory:', __import__('os').getcwd())\nprint('Python version:', __import__('sys').version)"
-    }
-    
-    try:
-        response = requests.post(url, json=payload)
-        print(f"Status Code: {response.status_code}")
-        print(f"Response: {json.dumps(response.json(), indent=2)}")
-        return response.status_code == 200
-    except Exception as e:
-        print(f"Error: {e}")
-        return False
+    _check_endpoint("run_python_code", _URL_RUN, _BODY_RUN)
 
 def test_list_dir():
     """Test the list_dir endpoint."""
-    print("\nTesting list_dir endpoint...")
-    
-    url = f"{BASE_URL}/mcp_api/list_dir"
-    payload = {
-        "user_dir": TEST_USER_DIR,
-        "dir_name": ""
-    }
-    
-    try:
-        response = requests.post(url, json=payload)
-        print(f"Status Code: {response.status_code}")
-        print(f"Response: {json.dumps(response.json(), indent=2)}")
-        return response.status_code == 200
-    except Exception as e:
-        print(f"Error: {e}")
-        return False
+    _check_endpoint("list_dir", _URL_LIST, _BODY_LIST)
 
 def test_list_dir_recursively():
-    """Test the list_dir_recursively endpoint."""
-    print("\nTesting list_dir_recursively endpoint...")
+    """Test the list_dir_recursively endpoint, one page at a time."""
+    _print("\nTesting list_dir_recursively endpoint...")
     
-    url = f"{BASE_URL}/mcp_api/list_dir_recursively"
-    payload = {
-        "user_dir": TEST_USER_DIR,
-        "dir_name": ""
-    }
-    
-    try:
-        response = requests.post(url, json=payload)
-        print(f"Status Code: {response.status_code}")
-        print(f"Response: {json.dumps(response.json(), indent=2)}")
-        return response.status_code == 200
-    except Exception as e:
-        print(f"Error: {e}")
-        return False
+    # Deep trees can list a great many entries; walking the listing in
+    # pages keeps each response body, and its decoded form, bounded
+    params = {"page_size": PAGE_SIZE}
+    pages = 0
+    items = 0
+    while True:
+        response = _post(_URL_LIST_R, _BODY_LIST, params=params)
+        _print(f"Status Code: {response.status_code}")
+        content = response.content
+        if pages == 0:
+            _print(_describe(content))
+        assert response.status_code == 200, f"expected status 200, got {response.status_code}"
+        page = _loads(content)
+        pages += 1
+        items += len(page.get("items", []))
+        if not page.get("next_cursor"):
+            break
+        params["cursor"] = page["next_cursor"]
+    _print(f"Listed {items} items in {pages} page(s)")
 
 def test_invalid_ip():
     """Test that requests from invalid IPs are rejected."""
-    print("\nTesting IP authentication (should be allowed from 127.0.0.1)...")
-    
-    url = f"{BASE_URL}/mcp_api/list_dir"
-    payload = {
-        "user_dir": TEST_USER_DIR,
-        "dir_name": ""
-    }
+    _print("\nTesting IP authentication (should be allowed from 127.0.0.1)...")
     
+    response = _post(_URL_LIST, _BODY_LIST)
+    _print(f"Status Code: {response.status_code}")
+    if response.status_code == 403:
+        _print("IP authentication working correctly - access denied")
+    else:
+        _print("IP authentication may not be working - access allowed")
+
+@functools.lru_cache(maxsize=1)
+def _server_alive(base_url):
+    """Return whether the Django server accepts connections; probed once per process."""
+    # A TCP connect is enough to tell the server is up, without an HTTP
+    # round-trip through Django's routing or a line in its request log
+    url = urlsplit(base_url)
     try:
-        response = requests.post(url, json=payload)
-        print(f"Status Code: {response.status_code}")
-        if response.status_code == 403:
-            print("IP authentication working correctly - access denied")
-        else:
-            print("IP authentication may not be working - access allowed")
+        socket.create_connection((url.hostname, url.port or 80), timeout=1).close()
         return True
-    except Exception as e:
-        print(f"Error: {e}")
+    except OSError:
         return False
 
+def run_test(test):
+    """Run one test, print its output and a separator in one piece, and return whether it passed."""
+    # Tests run concurrently; buffering each one's output keeps it together
+    _OUTPUT.buffer = io.StringIO()
+    try:
+        test()
+        passed = True
+    except Exception as e:
+        _print(f"Error: {e}")
+        passed = False
+    _print("-" * 50)
+    with _STDOUT_LOCK:
+        sys.stdout.write(_OUTPUT.buffer.getvalue())
+    _OUTPUT.buffer = None
+    return passed
+
 def main():
     """Run all tests."""
+    parser = argparse.ArgumentParser(description="MCP API Test Suite")
+    parser.add_argument(
+        "--verbose", action="store_true",
+        help="print full indented responses instead of their checksums"
+    )
+    args = parser.parse_args()
+    if args.verbose:
+        global VERBOSE
+        VERBOSE = True
+    
     print("MCP API Test Suite")
     print("=" * 50)
     
-    # Check if server is running
     try:
-        response = requests.get(f"{BASE_URL}/admin/")
-        print("✓ Django server is running")
-    except requests.exceptions.ConnectionError:
-        print("✗ Django server is not running. Please start it with:")
-        print("  uv run python project/manage.py runserver")
-        sys.exit(1)
-    
-    # Run tests
-    tests = [
-        test_run_python_code,
-        test_list_dir,
-        test_list_dir_recursively,
-        test_invalid_ip
-    ]
-    
-    passed = 0
-    total = len(tests)
-    
-    for test in tests:
-        if test():
-            passed += 1
-        print("-" * 50)
-    
-    print(f"\nTest Results: {passed}/{total} tests passed")
-    
-    if passed == total:
-        print("✓ All tests passed! MCP API is working correctly.")
-    else:
-        print("✗ Some tests failed. Please check the implementation.")
+        # Check if server is running
+        if _server_alive(BASE_URL):
+            print("✓ Django server is running")
+        else:
+            print("✗ Django server is not running. Please start it with:")
+            print("  uv run python project/manage.py runserver")
+            sys.exit(1)
+        
+        # Run tests
+        tests = [
+            test_run_python_code,
+            test_list_dir,
+            test_list_dir_recursively,
+            test_invalid_ip
+        ]
+        
+        total = len(tests)
+        
+        # The tests hit independent endpoints; run them at once so the
+        # suite waits for the slowest one rather than for all in turn
+        with ThreadPoolExecutor(max_workers=total) as executor:
+            results = list(executor.map(run_test, tests))
+        passed = sum(results)
+        
+        print(f"\nTest Results: {passed}/{total} tests passed")
+        
+        if passed == total:
+            print("✓ All tests passed! MCP API is working correctly.")
+        else:
+            print("✗ Some tests failed. Please check the implementation.")
+    finally:
+        SESSION.close()
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file